@@ -0,0 +1,40 @@
+from typing import Optional
+
+from fastapi import Response
+
+# Responses depend on the caller being signed in, so only the client may cache them
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> Optional[str]:
+    """
+    A strong ETag from version counters such as the feed generation, or None
+    when any of them is unknown and the response cannot be validated cheaply.
+    Counters carry a random epoch (see `services.version_counters`), so an
+    ETag handed out before Redis lost data cannot match again.
+    """
+    if any(part is None for part in parts):
+        return None
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Whether an If-None-Match header matches `etag`, using weak comparison."""
+    if not if_none_match or etag is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_headers(etag: Optional[str]) -> dict[str, str]:
+    if etag is None:
+        return {}
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -1,26 +1,38 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.principal_cache import principal_cache
 from core.security import verify_access_token
-from db.base import get_db
-from models.user import User
+from db.base import get_async_db
 from repositories.user import get_user_by_email
+from schemas.user import UserResponse
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
 
-def get_current_user(
-        db: Session = Depends(get_db),
+async def get_current_user(
+        db: AsyncSession = Depends(get_async_db),
         token: str = Depends(oauth2_scheme)
-) -> User:
-    """Extracts and verifies user from JWT token."""
+) -> UserResponse:
+    """
+    Extracts and verifies user from JWT token. Recently verified principals are
+    served from the principal cache without decoding the token or querying
+    the users table again.
+    """
+    principal = await principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     payload = verify_access_token(token=token)
 
-    user = get_user_by_email(db, email=payload["sub"])
+    user = await get_user_by_email(db, email=payload["sub"])
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    return user
+
+    principal = UserResponse.model_validate(user)
+    await principal_cache.set(token, principal, token_exp=payload["exp"])
+    return principal
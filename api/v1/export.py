@@ -0,0 +1,70 @@
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import APIRouter, HTTPException, status
+from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.replicas import get_read_db, read_session
+from repositories.article import stream_articles
+from services.category_registry import category_registry
+from services.gcloud_oidc_auth import verify_internal_service_token
+from utils.mapper import article_row_to_response
+
+router = APIRouter(tags=["Export"], prefix="/v1/export")
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+
+
+async def _ndjson_lines(**filters) -> AsyncIterator[bytes]:
+    """One JSON article per line, written batch by batch as rows arrive from the database."""
+    exported = 0
+    started = time.perf_counter()
+    try:
+        async with read_session() as db:
+            async for batch in stream_articles(db, batch_size=EXPORT_BATCH_SIZE, **filters):
+                yield b"".join(orjson.dumps(article_row_to_response(row)) + b"\n" for row in batch)
+                exported += len(batch)
+    finally:
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Exported {exported} articles in {elapsed:.2f}s "
+            f"({exported / elapsed if elapsed else 0:.0f} rows/sec), filters: {filters}"
+        )
+
+
+@router.get(
+    "/articles",
+    dependencies=[Depends(verify_internal_service_token)]
+)
+async def export_articles(
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+        category: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Internal route: Stream every matching article as NDJSON, oldest first.
+    `published_to` is exclusive. Rows are read through a server-side cursor,
+    so the export does not buffer the result set in memory.
+    """
+    category_id = None
+    if category is not None:
+        category_id = await category_registry.get_id(db, category)
+        if category_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown category")
+
+    lines = _ndjson_lines(
+        published_from=published_from,
+        published_to=published_to,
+        category_id=category_id,
+        sentiment=sentiment
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.params import Depends
+
+from core.security import password_hashing_executor
+from db.base import pool_status
+from db.replicas import replica_router
+from services.gcloud_oidc_auth import verify_internal_service_token
+
+router = APIRouter(tags=["Metrics"], prefix="/v1/metrics")
+
+
+@router.get(
+    "/password-hashing",
+    dependencies=[Depends(verify_internal_service_token)]
+)
+def password_hashing_metrics():
+    """Internal route: Queue length and latency of the password hashing pool in this worker."""
+    return password_hashing_executor.metrics()
+
+
+@router.get(
+    "/db-pools",
+    dependencies=[Depends(verify_internal_service_token)]
+)
+def db_pool_metrics():
+    """Internal route: Configured size and current usage of the connection pools and replicas in this worker."""
+    return {**pool_status(), "replicas": replica_router.status()}
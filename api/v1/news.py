@@ -1,72 +1,380 @@
-from typing import List, Optional
+import asyncio
+from typing import Awaitable, Callable, List, Optional
 
-from fastapi import APIRouter
+import orjson
+
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Response, status
 from fastapi.params import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.conditional import etag_headers, etag_matches, make_etag, not_modified
 from api.dependencies import get_current_user
-from db.base import get_db
-from repositories.article import get_trending_articles, get_category_articles, get_all_categories
-from schemas.news import ArticleResponse, CategoryResponse
+from core.cursors import Keyset, decode_cursor, decode_search_cursor, encode_cursor, encode_search_cursor
+from core.settings import settings
+from db.replicas import get_read_db, read_session
+from repositories.article import (
+    get_article_keyset,
+    get_articles_by_ids,
+    get_trending_articles,
+    get_category_articles,
+    get_feed_sections,
+    get_multi_category_articles,
+    search_article_ids,
+    category_feed_query,
+    trending_feed_query,
+)
+from schemas.news import ArticleResponse, CategoryResponse, HomeResponse
+from services import feed_cache, search_snapshots
+from services.category_registry import category_registry
+from utils.mapper import feed_section_json, serialize_feed_page
 
 router = APIRouter(tags=["News"], prefix="/v1")
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Fetches up to `limit` feed rows after a keyset
+FeedFetcher = Callable[[AsyncSession, Optional[Keyset], int], Awaitable[list[Row]]]
+
+
+class FeedResponse(Response):
+    """A feed page whose JSON body was already serialized, see `utils.mapper.serialize_feed_page`."""
+    media_type = "application/json"
+
+
+def _page_from_rows(rows: list[Row], page_size: int) -> tuple[bytes, Optional[str]]:
+    """Serialize a page fetched with one row of lookahead, which tells whether there is a next one."""
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor((rows[-1].published_at, rows[-1].id))
+    return serialize_feed_page(rows), next_cursor
+
+
+async def _load_page(
+        db: AsyncSession,
+        fetch: FeedFetcher,
+        after: Optional[Keyset],
+        page_size: int
+) -> tuple[bytes, Optional[str]]:
+    return _page_from_rows(await fetch(db, after, page_size + 1), page_size)
+
+
+async def _prefetch_page(
+        fetch: FeedFetcher,
+        cursor: str,
+        feed: str,
+        generation: Optional[str],
+        page_size: int,
+        **cache_key
+):
+    """Cache the page after `cursor`, unless a client or another worker already did."""
+    if await feed_cache.has_page(feed, generation, position=cursor, page_size=page_size, **cache_key):
+        return
+    async with read_session() as db:
+        page, next_cursor = await _load_page(db, fetch, decode_cursor(cursor), page_size)
+    await feed_cache.set_page(page, next_cursor, feed, generation, position=cursor, page_size=page_size, **cache_key)
+
+
+async def _serve_feed(
+        db: AsyncSession,
+        feed: str,
+        fetch: FeedFetcher,
+        cursor: Optional[str],
+        last_item_id: Optional[int],
+        page_size: int,
+        if_none_match: Optional[str],
+        background_tasks: BackgroundTasks,
+        **cache_key
+) -> Response:
+    """
+    Serve a feed page in (published_at, id) order. `cursor` is the `X-Next-Cursor`
+    of the previous page; `last_item_id` is still accepted for older clients.
+    """
+    generation = await feed_cache.get_generation(feed)
+    # The generation moves with every ingestion, so it validates the page without querying it
+    etag = make_etag(feed, generation)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    after = decode_cursor(cursor) if cursor else None
+    position = cursor or (f"id-{last_item_id}" if last_item_id is not None else None)
+
+    cached = await feed_cache.get_page(feed, generation, position=position, page_size=page_size, **cache_key)
+    if cached is not None:
+        page, next_cursor = cached
+    else:
+        if after is None and last_item_id is not None:
+            after = await get_article_keyset(db, last_item_id)
+        if after is None and last_item_id is not None:
+            page, next_cursor = b"[]", None
+        else:
+            page, next_cursor = await _load_page(db, fetch, after, page_size)
+        await feed_cache.set_page(
+            page, next_cursor, feed, generation, position=position, page_size=page_size, **cache_key
+        )
+
+    headers = etag_headers(etag)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+        if settings.FEED_PREFETCH_ENABLED:
+            background_tasks.add_task(
+                _prefetch_page, fetch, next_cursor, feed, generation, page_size, **cache_key
+            )
+    return FeedResponse(page, headers=headers)
+
+
+def _category_fetcher(category: Optional[str]) -> FeedFetcher:
+    async def fetch(db: AsyncSession, after: Optional[Keyset], limit: int) -> list[Row]:
+        category_id = None
+        if category is not None and category != "all":
+            category_id = await category_registry.get_id(db, category)
+            if category_id is None:
+                return []
+        return await get_category_articles(db, after=after, category_id=category_id, page_size=limit)
+
+    return fetch
+
+
+def _multi_category_fetcher(categories: list[str]) -> FeedFetcher:
+    async def fetch(db: AsyncSession, after: Optional[Keyset], limit: int) -> list[Row]:
+        category_ids = []
+        for category in categories:
+            category_id = await category_registry.get_id(db, category)
+            if category_id is not None:
+                category_ids.append(category_id)
+        if not category_ids:
+            return []
+        return await get_multi_category_articles(db, category_ids=category_ids, after=after, page_size=limit)
+
+    return fetch
+
+
+def _trending_fetcher(omit_negative_sentiment: bool) -> FeedFetcher:
+    async def fetch(db: AsyncSession, after: Optional[Keyset], limit: int) -> list[Row]:
+        return await get_trending_articles(
+            db, after=after, omit_negative_sentiment=omit_negative_sentiment, page_size=limit
+        )
+
+    return fetch
+
 
 @router.get(
     "/category-news/all",
     response_model=List[ArticleResponse],
+    response_class=FeedResponse,
     dependencies=[Depends(get_current_user)]
 )
-def fetch_unfiltered_news(
-        db: Session = Depends(get_db),
+async def fetch_unfiltered_news(
+        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_read_db),
+        cursor: Optional[str] = None,
         last_item_id: Optional[int] = None,
-        page_size: int = 25
+        page_size: int = Query(25, ge=1),
+        if_none_match: Optional[str] = Header(None)
 ):
     """Protected route: Fetch all news, irrespective of category."""
     if page_size > 50:
         page_size = 50
-    articles = get_category_articles(db=db, last_item_id=last_item_id, page_size=page_size)
-    return articles
+    return await _serve_feed(
+        db, feed_cache.CATEGORY_FEED, _category_fetcher(None), cursor, last_item_id, page_size,
+        if_none_match, background_tasks, category=None
+    )
+
+
+@router.get(
+    "/category-news",
+    response_model=List[ArticleResponse],
+    response_class=FeedResponse,
+    dependencies=[Depends(get_current_user)]
+)
+async def fetch_multi_category_articles(
+        background_tasks: BackgroundTasks,
+        categories: List[str] = Query(min_length=1, max_length=20),
+        cursor: Optional[str] = None,
+        page_size: int = Query(25, ge=1),
+        db: AsyncSession = Depends(get_read_db),
+        if_none_match: Optional[str] = Header(None)
+):
+    """Protected route: Fetch one merged page of news from several categories."""
+    if page_size > 50:
+        page_size = 50
+    if "all" in categories:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use /v1/category-news/all for news from every category"
+        )
+    categories = sorted(set(categories))
+    return await _serve_feed(
+        db, feed_cache.CATEGORY_FEED, _multi_category_fetcher(categories), cursor, None, page_size,
+        if_none_match, background_tasks, category=tuple(categories)
+    )
 
 
 @router.get(
     "/category-news/{category}",
     response_model=List[ArticleResponse],
+    response_class=FeedResponse,
     dependencies=[Depends(get_current_user)]
 )
-def fetch_category_articles(
+async def fetch_category_articles(
         category: str,
+        background_tasks: BackgroundTasks,
+        cursor: Optional[str] = None,
         last_item_id: int = None,
-        page_size: int = 25,
-        db: Session = Depends(get_db)
+        page_size: int = Query(25, ge=1),
+        db: AsyncSession = Depends(get_read_db),
+        if_none_match: Optional[str] = Header(None)
 ):
     """Protected route: Fetch category-wise news."""
     if page_size > 50:
         page_size = 50
-    return get_category_articles(db, category=category, last_item_id=last_item_id, page_size=page_size)
+    return await _serve_feed(
+        db, feed_cache.CATEGORY_FEED, _category_fetcher(category), cursor, last_item_id, page_size,
+        if_none_match, background_tasks, category=category
+    )
 
 
 @router.get(
     "/trending-topics",
     response_model=List[ArticleResponse],
+    response_class=FeedResponse,
     dependencies=[Depends(get_current_user)]
 )
-def fetch_trending_topics(
+async def fetch_trending_topics(
+        background_tasks: BackgroundTasks,
+        cursor: Optional[str] = None,
         last_item_id: int = None,
-        page_size: int = 25,
+        page_size: int = Query(25, ge=1),
         omit_negative_sentiment: bool = False,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_read_db),
+        if_none_match: Optional[str] = Header(None)
 ):
     """Protected route: Fetch trending news."""
     if page_size > 50:
         page_size = 50
-    articles = get_trending_articles(
-        db=db,
-        last_item_id=last_item_id,
-        omit_negative_sentiment=omit_negative_sentiment,
-        page_size=page_size
+    return await _serve_feed(
+        db, feed_cache.TRENDING_FEED, _trending_fetcher(omit_negative_sentiment), cursor, last_item_id,
+        page_size, if_none_match, background_tasks, omit_negative_sentiment=omit_negative_sentiment
+    )
+
+
+@router.get(
+    "/search",
+    response_model=List[ArticleResponse],
+    response_class=FeedResponse,
+    dependencies=[Depends(get_current_user)]
+)
+async def search_news(
+        q: str = Query(min_length=3, max_length=200),
+        cursor: Optional[str] = None,
+        page_size: int = Query(25, ge=1),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Protected route: Search article titles and descriptions, best and most
+    recent matches first. Matches are ranked once, by the first page, and later
+    pages are read from that ranking, so they neither skip nor repeat results
+    when ingestion changes the scores in between. A cursor whose ranking has
+    expired gets a 410; search again. A cursor only continues the query it was
+    issued for.
+    """
+    if page_size > 50:
+        page_size = 50
+    if cursor:
+        snapshot, offset = decode_search_cursor(cursor, q)
+        article_ids = await search_snapshots.get_ids(snapshot, offset, page_size + 1)
+        if article_ids is None:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="Search results expired")
+    else:
+        snapshot, offset = None, 0
+        article_ids = await search_article_ids(
+            db, q, recency_weight=settings.SEARCH_RECENCY_WEIGHT, limit=settings.SEARCH_MAX_RESULTS
+        )
+        if len(article_ids) > page_size:
+            # Without a snapshot only the first page is served
+            snapshot = await search_snapshots.save(article_ids)
+
+    headers = {}
+    if len(article_ids) > page_size and snapshot is not None:
+        headers[NEXT_CURSOR_HEADER] = encode_search_cursor((snapshot, offset + page_size), q)
+    rows = await get_articles_by_ids(db, article_ids[:page_size])
+    return FeedResponse(serialize_feed_page(rows), headers=headers)
+
+
+@router.get(
+    "/home",
+    response_model=HomeResponse,
+    response_class=FeedResponse,
+    dependencies=[Depends(get_current_user)]
+)
+async def fetch_home(
+        categories: List[str] = Query(default=[], max_length=10),
+        page_size: int = Query(10, ge=1),
+        omit_negative_sentiment: bool = False,
+        db: AsyncSession = Depends(get_read_db),
+        if_none_match: Optional[str] = Header(None)
+):
+    """
+    Protected route: Everything the home screen shows in one response, i.e. the
+    first page of trending news, the categories and the first page of each
+    requested category. Sections carry their own cursor for the regular feed
+    endpoints. Uncached sections are loaded with a single query.
+    """
+    if page_size > 50:
+        page_size = 50
+    categories = sorted(set(categories))
+
+    category_generation, trending_generation = await asyncio.gather(
+        feed_cache.get_generation(feed_cache.CATEGORY_FEED),
+        feed_cache.get_generation(feed_cache.TRENDING_FEED),
     )
-    return [ArticleResponse.model_validate(article) for article in articles] if articles else []
+    category_list = await category_registry.all(db)
+    etag = make_etag("home", category_generation, trending_generation, category_registry.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    # (feed, generation, cache key) of every section, trending first
+    sections = [(feed_cache.TRENDING_FEED, trending_generation, dict(omit_negative_sentiment=omit_negative_sentiment))]
+    sections += [(feed_cache.CATEGORY_FEED, category_generation, dict(category=category)) for category in categories]
+
+    pages = await asyncio.gather(*(
+        feed_cache.get_page(feed, generation, page_size=page_size, **cache_key)
+        for feed, generation, cache_key in sections
+    ))
+
+    missing, queries = [], []
+    for index, (feed, _, cache_key) in enumerate(sections):
+        if pages[index] is not None:
+            continue
+        if feed == feed_cache.TRENDING_FEED:
+            query = trending_feed_query(omit_negative_sentiment=omit_negative_sentiment, page_size=page_size + 1)
+        else:
+            category_id = await category_registry.get_id(db, cache_key["category"])
+            if category_id is None:
+                pages[index] = (b"[]", None)
+                continue
+            query = category_feed_query(category_id=category_id, page_size=page_size + 1)
+        missing.append(index)
+        queries.append(query)
+
+    writes = []
+    for index, rows in zip(missing, await get_feed_sections(db, queries)):
+        feed, generation, cache_key = sections[index]
+        pages[index] = _page_from_rows(rows, page_size)
+        writes.append(feed_cache.set_page(*pages[index], feed, generation, page_size=page_size, **cache_key))
+    await asyncio.gather(*writes)
+
+    category_feeds = b",".join(
+        orjson.dumps(category) + b":" + feed_section_json(*page)
+        for category, page in zip(categories, pages[1:])
+    )
+    body = (
+        b'{"trending":' + feed_section_json(*pages[0])
+        + b',"categories":' + orjson.dumps(category_list)
+        + b',"category_feeds":{' + category_feeds + b"}}"
+    )
+    return FeedResponse(body, headers=etag_headers(etag))
 
 
 @router.get(
@@ -74,6 +382,15 @@ def fetch_trending_topics(
     response_model=List[CategoryResponse],
     dependencies=[Depends(get_current_user)]
 )
-def fetch_categories(db: Session = Depends(get_db)):
+async def fetch_categories(
+        response: Response,
+        db: AsyncSession = Depends(get_read_db),
+        if_none_match: Optional[str] = Header(None)
+):
     """Protected route: Fetch all categories."""
-    return get_all_categories(db=db)
+    categories = await category_registry.all(db)
+    etag = make_etag("categories", category_registry.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return categories
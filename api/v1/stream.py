@@ -0,0 +1,83 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependencies import get_current_user
+from db.base import get_async_db
+from services.article_events import RESYNC, article_event_hub
+from services.category_registry import category_registry
+
+router = APIRouter(tags=["Stream"], prefix="/v1/stream")
+
+# Comment lines sent while idle keep proxies from closing the connection
+HEARTBEAT_SECONDS = 15
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode("ascii") + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def _filter_event(event: dict, categories: List[str], trending: bool) -> dict:
+    """The part of an article event a client asked for; empty `categories` means all of them."""
+    by_category = event.get("categories", {})
+    if categories:
+        by_category = {name: ids for name, ids in by_category.items() if name in categories}
+    filtered = {}
+    if by_category:
+        filtered["categories"] = by_category
+    if trending and event.get("trending"):
+        filtered["trending"] = event["trending"]
+    return filtered
+
+
+async def _article_events(request: Request, categories: List[str], trending: bool) -> AsyncIterator[bytes]:
+    queue = article_event_hub.subscribe()
+    try:
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if event is RESYNC:
+                yield _sse("resync", {})
+                continue
+            filtered = _filter_event(event, categories, trending)
+            if filtered:
+                yield _sse("articles", filtered)
+    finally:
+        article_event_hub.unsubscribe(queue)
+
+
+@router.get(
+    "/articles",
+    dependencies=[Depends(get_current_user)]
+)
+async def stream_articles(
+        request: Request,
+        categories: List[str] = Query(default=[]),
+        trending: bool = True,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Server-sent events announcing new articles as they are ingested.
+    `articles` events carry the ids of new articles by category and the ids of
+    a new trending set; fetch them through the feed routes. A `resync` event
+    means events were missed and the client should reload its feeds.
+    """
+    for category in categories:
+        if await category_registry.get_id(db, category) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown category")
+    # The stream stays open indefinitely, it must not hold a database connection
+    await db.close()
+
+    return StreamingResponse(
+        _article_events(request, categories, trending),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,21 +1,21 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth import authenticate_user, register_user, refresh_tokens
-from db.base import get_db
+from db.base import get_async_db
 from schemas.user import UserCreate, TokenResponse, LoginRequest, RefreshTokenRequest
 
 router = APIRouter(tags=["Authentication"], prefix="/v1")
 
 
 @router.post("/signup", response_model=TokenResponse)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
-    return register_user(db, user)
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    return await register_user(db, user)
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(user_credentials: LoginRequest, db: Session = Depends(get_db)):
-    return authenticate_user(db, user_credentials)
+async def login(user_credentials: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    return await authenticate_user(db, user_credentials)
 
 
 @router.post("/refresh", response_model=TokenResponse)
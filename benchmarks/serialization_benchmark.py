@@ -0,0 +1,118 @@
+"""
+Feed page serialization cost: utils.mapper.serialize_feed_page on feed rows
+against the path it replaced, ORM articles through ArticleResponse.model_validate,
+then FastAPI's response_model validation and serialization of
+List[ArticleResponse], then the stdlib json encoding of JSONResponse, for pages
+of 25 and 50 articles.
+
+Only serialization is timed, the pages are loaded once from an in-memory
+SQLite database:
+
+    python benchmarks/serialization_benchmark.py
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, joinedload
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db.base import Base  # noqa: E402
+from models.news import Article, Category, Source  # noqa: E402
+from repositories.article import category_feed_query  # noqa: E402
+from schemas.news import ArticleResponse  # noqa: E402
+from utils.mapper import serialize_feed_page  # noqa: E402
+
+# FastAPI validates and serializes a route's return value against its response_model like this
+RESPONSE_ADAPTER = TypeAdapter(List[ArticleResponse])
+
+
+def seed(engine, articles: int):
+    published_at = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [dict(id=i, name=f"category-{i}") for i in range(1, 6)])
+        conn.execute(insert(Source), [
+            dict(id=i, name=f"source-{i}", logo_url=f"https://example.com/logo-{i}.png") for i in range(1, 11)
+        ])
+        conn.execute(insert(Article), [
+            dict(
+                id=i,
+                uuid=f"uuid-{i}",
+                title=f"Article {i}, with a headline about as long as the scraper's",
+                url=f"https://example.com/articles/{i}",
+                description="A short description of the article, about as long as the scraper's.",
+                url_to_image=f"https://example.com/articles/{i}.jpg",
+                published_at=published_at - timedelta(minutes=i),
+                sentiment="positive" if i % 2 else "negative",
+                source_id=i % 10 + 1,
+                category_id=i % 5 + 1,
+            )
+            for i in range(1, articles + 1)
+        ])
+
+
+def rows_path(rows) -> bytes:
+    return serialize_feed_page(rows)
+
+
+def orm_path(db_articles) -> bytes:
+    """What a feed route did before serialize_feed_page."""
+    responses = [ArticleResponse.model_validate(db_article) for db_article in db_articles]
+    validated = RESPONSE_ADAPTER.validate_python(responses)
+    content = RESPONSE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def microseconds_per_page(serialize, page, repeat: int, number: int) -> float:
+    """Median microseconds of one call, over `repeat` rounds of `number` calls."""
+    serialize(page)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            serialize(page)
+        samples.append((time.perf_counter() - started) / number * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 50])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    seed(engine, max(args.sizes))
+
+    print(f"median of {args.repeat} rounds of {args.number} pages")
+    print(f"{'page':>5}  {'rows us':>8}  {'ORM us':>8}  speedup")
+    for size in args.sizes:
+        with Session(engine) as db:
+            rows = db.execute(category_feed_query(page_size=size)).all()
+            db_articles = db.scalars(
+                select(Article)
+                .options(joinedload(Article.source), joinedload(Article.category))
+                .order_by(Article.published_at.desc(), Article.id.desc())
+                .limit(size)
+            ).all()
+            assert json.loads(rows_path(rows)) == json.loads(orm_path(db_articles))
+
+            rows_us = microseconds_per_page(rows_path, rows, args.repeat, args.number)
+            orm_us = microseconds_per_page(orm_path, db_articles, args.repeat, args.number)
+        print(f"{size:>5}  {rows_us:>8.1f}  {orm_us:>8.1f}  {orm_us / rows_us:6.1f}x")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
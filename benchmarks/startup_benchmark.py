@@ -0,0 +1,91 @@
+"""
+Process startup cost: importing the app (main) and loading the secrets on
+first use, measured in fresh processes with the secret settings of the
+current environment (SECRETS_PROVIDER, SECRETS_CACHE_PATH, ...).
+
+Each configuration is reported for:
+- sequential: one provider call per secret, as settings did before loading
+  them together
+- concurrent: every secret in one provider call, the current behaviour
+- warm cache: read from the encrypted secrets cache, when
+  SECRETS_CACHE_PATH and SECRETS_CACHE_KEY are set; the other runs start
+  with the cache file removed
+
+    SECRETS_PROVIDER=secretmanager PROJECT_ID=... python benchmarks/startup_benchmark.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def child(sequential: bool):
+    """Runs in a fresh process: time the app import, then the secret load."""
+    sys.path.insert(0, str(ROOT))
+    started = time.perf_counter()
+    import main  # noqa: F401
+    imported = time.perf_counter()
+
+    from core import settings as settings_module
+    if sequential:
+        provider = settings_module.get_secret_provider(settings_module.settings)
+        for name in settings_module.SECRET_NAMES:
+            provider.fetch([name])
+    else:
+        settings_module.get_secret(settings_module.SECRET_NAMES[0])
+    loaded = time.perf_counter()
+
+    print(json.dumps({"import_ms": (imported - started) * 1000, "secrets_ms": (loaded - imported) * 1000}))
+
+
+def run(repeat: int, sequential: bool = False, clear_cache: bool = False) -> tuple[float, float]:
+    """Median import and secret load milliseconds over `repeat` fresh processes."""
+    cache_path = os.getenv("SECRETS_CACHE_PATH")
+    samples = []
+    for _ in range(repeat):
+        if clear_cache and cache_path:
+            Path(cache_path).unlink(missing_ok=True)
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", *(["--sequential"] if sequential else [])],
+            check=True, capture_output=True, text=True, cwd=ROOT
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return (
+        statistics.median(sample["import_ms"] for sample in samples),
+        statistics.median(sample["secrets_ms"] for sample in samples),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--sequential", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.sequential)
+        return
+
+    cached = bool(os.getenv("SECRETS_CACHE_PATH") and os.getenv("SECRETS_CACHE_KEY"))
+    runs = {
+        "sequential": dict(sequential=True, clear_cache=True),
+        "concurrent": dict(clear_cache=True),
+    }
+    if cached:
+        runs["warm cache"] = dict()
+
+    print(f"provider: {os.getenv('SECRETS_PROVIDER', 'secretmanager')}, median of {args.repeat} processes")
+    print(f"{'':<12}  {'import ms':>9}  {'secrets ms':>10}")
+    for name, options in runs.items():
+        import_ms, secrets_ms = run(args.repeat, **options)
+        print(f"{name:<12}  {import_ms:>9.1f}  {secrets_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
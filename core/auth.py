@@ -1,21 +1,21 @@
 import re
 
 from fastapi import status, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.security import verify_password, create_access_token, create_refresh_token, verify_refresh_token
+from core.security import verify_password_async, create_access_token, create_refresh_token, verify_refresh_token
 from repositories.user import get_user_by_email, create_user
 from schemas.user import LoginRequest, TokenResponse, UserCreate
 
 
-def register_user(db: Session, user_credentials: UserCreate) -> TokenResponse:
+async def register_user(db: AsyncSession, user_credentials: UserCreate) -> TokenResponse:
     if not user_credentials.name or not user_credentials.email or not user_credentials.password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Name, email and password are required to register a user"
         )
 
-    user = get_user_by_email(db, user_credentials.email)
+    user = await get_user_by_email(db, user_credentials.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,22 +35,22 @@ def register_user(db: Session, user_credentials: UserCreate) -> TokenResponse:
             detail="Password is too short"
         )
 
-    user = create_user(db, user_credentials)
+    user = await create_user(db, user_credentials)
     access_token = create_access_token({"sub": user.email})
     refresh_token = create_refresh_token({"sub": user.email})
 
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
-def authenticate_user(db: Session, login_data: LoginRequest) -> TokenResponse:
+async def authenticate_user(db: AsyncSession, login_data: LoginRequest) -> TokenResponse:
     if not login_data.email or not login_data.password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email and password are required to login"
         )
 
-    user = get_user_by_email(db, login_data.email)
-    if user is None or not verify_password(login_data.password, user.hashed_password):
+    user = await get_user_by_email(db, login_data.email)
+    if user is None or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Incorrect email or password"
@@ -0,0 +1,83 @@
+import base64
+import hashlib
+import hmac
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+from core.settings import settings
+
+SIGNATURE_BYTES = 16
+
+# (published_at, id) of the last article a client has seen
+Keyset = tuple[datetime, int]
+# (snapshot, offset) of the next search result, see services.search_snapshots
+SearchPosition = tuple[str, int]
+
+
+def _sign(payload: bytes) -> bytes:
+    key = hmac.new(settings.JWT_ACCESS_SECRET.encode("utf-8"), b"feed-cursor", hashlib.sha256).digest()
+    return hmac.new(key, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def _pack(kind: str, *values) -> str:
+    payload = "|".join([kind, *map(str, values)]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload + _sign(payload)).rstrip(b"=").decode("ascii")
+
+
+def _unpack(kind: str, cursor: str) -> list[str]:
+    """The values of a cursor of the given kind, raising 400 if it was altered or is of another kind."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload, signature = raw[:-SIGNATURE_BYTES], raw[-SIGNATURE_BYTES:]
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("bad signature")
+        cursor_kind, *values = payload.decode("utf-8").split("|")
+        if cursor_kind != kind:
+            raise ValueError("wrong cursor kind")
+        return values
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_cursor(keyset: Keyset) -> str:
+    """An opaque, signed token for the feed position after `keyset`."""
+    published_at, article_id = keyset
+    return _pack("feed", published_at.isoformat(), article_id)
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    """Return the keyset of a cursor issued by `encode_cursor`, raising 400 if it was altered."""
+    published_at, article_id = _unpack("feed", cursor)
+    try:
+        return datetime.fromisoformat(published_at), int(article_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _query_digest(query: str) -> str:
+    """A digest of a search query, ignoring case and repeated whitespace like the search itself."""
+    normalized = " ".join(query.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_search_cursor(position: SearchPosition, query: str) -> str:
+    """An opaque, signed token for a position in the result snapshot of the search for `query`."""
+    snapshot, offset = position
+    return _pack("search", snapshot, offset, _query_digest(query))
+
+
+def decode_search_cursor(cursor: str, query: str) -> SearchPosition:
+    """
+    Return the position of a cursor issued by `encode_search_cursor`, raising
+    400 if it was altered or belongs to a search for another query.
+    """
+    values = _unpack("search", cursor)
+    try:
+        snapshot, offset, query_digest = values
+        position = snapshot, int(offset)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if not hmac.compare_digest(query_digest, _query_digest(query)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor belongs to another search query")
+    return position
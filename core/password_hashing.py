@@ -0,0 +1,111 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+# Kept free of settings imports: pool processes import this module to run the hash functions
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password):
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHashingExecutor:
+    """
+    Runs bcrypt off the event loop in a dedicated, size-limited pool. Calls
+    beyond `max_pending` in-flight operations are rejected with a 503 right
+    away instead of queueing behind a login burst.
+
+    Pool processes are started through a forkserver: forking the worker
+    itself, which already runs threads, can deadlock the child. The pool is
+    created at application startup and replaced when a process dies and
+    breaks it.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, use_processes: bool = True):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def _create_executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("forkserver")
+            )
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    def _replace_broken(self, executor: Executor):
+        """Replace a broken pool, once for all the calls that failed on it."""
+        if self._executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+
+    def start(self):
+        """Create the pool, at startup rather than inside the first login request."""
+        self._get_executor()
+
+    async def run(self, func: Callable, *args):
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests in progress, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        self._pending += 1
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                # A pool process died (e.g. killed for memory): retry once in a fresh pool
+                self._replace_broken(executor)
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._pending -= 1
+            self._completed += 1
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+
+    def metrics(self) -> dict:
+        """Snapshot of queue length and hash latency for this process."""
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_latency_ms": round(self._total_seconds / self._completed * 1000, 2) if self._completed else 0.0,
+            "max_latency_ms": round(self._max_seconds * 1000, 2),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
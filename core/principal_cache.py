@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+
+from core.settings import settings
+from schemas.user import UserResponse
+from services.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "principal"
+# Emails of users whose principals every process must evict
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+
+def token_digest(token: str) -> str:
+    """Key principals by a digest so raw bearer tokens are never stored."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of recently verified principals, keyed by access token digest.
+    Every entry expires at the earlier of the configured TTL and the token's
+    own `exp`, so a cached principal never outlives its token. An optional
+    Redis tier shares verified principals between workers.
+
+    Invalidations are broadcast over Redis pub/sub, so every worker evicts the
+    user from its local tier. The local tier only answers while this process
+    is subscribed; after a reconnect it starts empty, since invalidations sent
+    in between were missed.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, use_redis: bool = False, reconnect_delay: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.reconnect_delay = reconnect_delay
+        self._entries: OrderedDict[str, tuple[float, UserResponse]] = OrderedDict()
+        self._digests_by_email: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._subscribed = False
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen_for_invalidations())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def _listen_for_invalidations(self):
+        while True:
+            try:
+                async with get_async_redis().pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    self._clear_local()
+                    self._subscribed = True
+                    async for message in pubsub.listen():
+                        self._evict_local(message["data"])
+            except (redis.RedisError, OSError) as e:
+                logger.warning(f"Principal invalidation subscription lost, reconnecting: {str(e)}")
+            finally:
+                self._subscribed = False
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _clear_local(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests_by_email.clear()
+
+    def _evict_local(self, email: str):
+        with self._lock:
+            for digest in self._digests_by_email.pop(email, set()):
+                self._entries.pop(digest, None)
+
+    def _expires_at(self, token_exp: float) -> float:
+        return min(time.time() + self.ttl_seconds, token_exp)
+
+    def _store_local(self, digest: str, principal: UserResponse, expires_at: float):
+        with self._lock:
+            self._entries[digest] = (expires_at, principal)
+            self._entries.move_to_end(digest)
+            self._digests_by_email.setdefault(principal.email, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                evicted_digest, (_, evicted) = self._entries.popitem(last=False)
+                self._forget_digest(evicted.email, evicted_digest)
+
+    def _forget_digest(self, email: str, digest: str):
+        digests = self._digests_by_email.get(email)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._digests_by_email[email]
+
+    def _get_local(self, digest: str) -> Optional[UserResponse]:
+        if not self._subscribed:
+            # Without the subscription this process would miss invalidations
+            return None
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                self._forget_digest(principal.email, digest)
+                return None
+            self._entries.move_to_end(digest)
+            return principal
+
+    async def get(self, token: str) -> Optional[UserResponse]:
+        """Return the cached principal for a token, checking Redis on a local miss."""
+        digest = token_digest(token)
+        principal = self._get_local(digest)
+        if principal is not None or not self.use_redis:
+            return principal
+
+        try:
+            client = get_async_redis()
+            cached = await client.get(f"{KEY_PREFIX}:{digest}")
+            if cached is None:
+                return None
+            ttl = await client.ttl(f"{KEY_PREFIX}:{digest}")
+        except redis.RedisError as e:
+            logger.warning(f"Principal cache read failed: {str(e)}")
+            return None
+
+        principal = UserResponse(**json.loads(cached))
+        if ttl > 0:
+            self._store_local(digest, principal, time.time() + ttl)
+        return principal
+
+    async def set(self, token: str, principal: UserResponse, token_exp: float):
+        """Cache a principal verified against the database for this token."""
+        digest = token_digest(token)
+        expires_at = self._expires_at(token_exp)
+        ttl = int(expires_at - time.time())
+        if ttl <= 0:
+            return
+
+        self._store_local(digest, principal, expires_at)
+        if not self.use_redis:
+            return
+
+        try:
+            pipe = get_async_redis().pipeline()
+            pipe.set(f"{KEY_PREFIX}:{digest}", principal.model_dump_json(), ex=ttl)
+            pipe.sadd(f"{KEY_PREFIX}-user:{principal.email}", digest)
+            pipe.expire(f"{KEY_PREFIX}-user:{principal.email}", self.ttl_seconds)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Principal cache write failed: {str(e)}")
+
+    async def invalidate_user(self, email: str):
+        """
+        Evict every cached principal of a user, e.g. after it was changed or
+        deleted, from the Redis tier and from the local tier of every worker.
+        """
+        self._evict_local(email)
+
+        try:
+            client = get_async_redis()
+            if self.use_redis:
+                # Cleared before broadcasting, so no worker refills its local tier from a stale entry
+                digests = await client.smembers(f"{KEY_PREFIX}-user:{email}")
+                await client.delete(
+                    f"{KEY_PREFIX}-user:{email}",
+                    *(f"{KEY_PREFIX}:{digest}" for digest in digests)
+                )
+            await client.publish(INVALIDATION_CHANNEL, email)
+        except redis.RedisError as e:
+            logger.error(f"Failed to invalidate cached principals of {email}: {str(e)}")
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    use_redis=settings.PRINCIPAL_CACHE_REDIS_ENABLED,
+)
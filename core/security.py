@@ -4,28 +4,32 @@ from datetime import datetime, timedelta, timezone
 import jwt
 from dotenv import load_dotenv
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
+from core.password_hashing import PasswordHashingExecutor, hash_password, verify_password
 from core.settings import settings
 
 load_dotenv()
 
-JWT_ACCESS_SECRET = settings.JWT_ACCESS_SECRET
-JWT_REFRESH_SECRET = settings.JWT_REFRESH_SECRET
 ALGORITHM = os.getenv("ALGORITHM")
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 15
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hashing_executor = PasswordHashingExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES,
+)
 
 
-def hash_password(password):
-    return pwd_context.hash(password)
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the bounded hashing pool, raising 503 when it is saturated."""
+    return await password_hashing_executor.run(hash_password, password)
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the bounded hashing pool, raising 503 when it is saturated."""
+    return await password_hashing_executor.run(verify_password, plain_password, hashed_password)
 
 
 def create_jwt_token(data: dict, expires_delta: timedelta, secret: str):
@@ -77,25 +81,25 @@ def verify_jwt_token(token: str, secret: str):
 
 def verify_access_token(token: str):
     """Wrapper function for access token verification."""
-    return verify_jwt_token(token, JWT_ACCESS_SECRET)
+    return verify_jwt_token(token, settings.JWT_ACCESS_SECRET)
 
 
 def verify_refresh_token(token: str):
     """Wrapper function for refresh token verification."""
-    return verify_jwt_token(token, JWT_REFRESH_SECRET)
+    return verify_jwt_token(token, settings.JWT_REFRESH_SECRET)
 
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None):
     """Wrapper to generate an refresh token."""
     if expires_delta:
-        return create_jwt_token(data, expires_delta, secret=JWT_REFRESH_SECRET)
+        return create_jwt_token(data, expires_delta, secret=settings.JWT_REFRESH_SECRET)
     expires_delta = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    return create_jwt_token(data=data, expires_delta=expires_delta, secret=JWT_REFRESH_SECRET)
+    return create_jwt_token(data=data, expires_delta=expires_delta, secret=settings.JWT_REFRESH_SECRET)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """Wrapper to generate an access token."""
     if expires_delta:
-        return create_jwt_token(data, expires_delta, secret=JWT_ACCESS_SECRET)
+        return create_jwt_token(data, expires_delta, secret=settings.JWT_ACCESS_SECRET)
     expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    return create_jwt_token(data=data, expires_delta=expires_delta, secret=JWT_ACCESS_SECRET)
+    return create_jwt_token(data=data, expires_delta=expires_delta, secret=settings.JWT_ACCESS_SECRET)
@@ -1,15 +1,120 @@
+import json
+import logging
 import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
 
-from google.cloud import secretmanager
+from dotenv import dotenv_values
 from pydantic.v1 import BaseSettings
 
+logger = logging.getLogger(__name__)
+
+SECRET_NAMES = ("REDIS_PASSWORD", "DB_PASSWORD", "JWT_ACCESS_SECRET", "JWT_REFRESH_SECRET")
+
+
+class SecretProvider(ABC):
+    """Source of the application secrets."""
+
+    name: str
+
+    @abstractmethod
+    def fetch(self, names: Iterable[str]) -> dict[str, str]:
+        """Return the value of every secret in `names`, raising if any of them is missing."""
+
+
+class SecretManagerProvider(SecretProvider):
+    """Google Secret Manager; all secrets are requested concurrently."""
+
+    name = "secretmanager"
+
+    def __init__(self, project_id: str, version: str = "1"):
+        self.project_id = project_id
+        self.version = version
+
+    def fetch(self, names: Iterable[str]) -> dict[str, str]:
+        from google.cloud import secretmanager
+
+        names = list(names)
+        client = secretmanager.SecretManagerServiceClient()
+
+        def get_secret(name: str) -> str:
+            secret_name = f"projects/{self.project_id}/secrets/{name}/versions/{self.version}"
+            return client.access_secret_version(name=secret_name).payload.data.decode("UTF-8")
+
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            return dict(zip(names, executor.map(get_secret, names)))
+
+
+class EnvSecretProvider(SecretProvider):
+    """Environment variables, falling back to the .env file; for local runs."""
+
+    name = "env"
+
+    def fetch(self, names: Iterable[str]) -> dict[str, str]:
+        dotenv = dotenv_values(".env")
+        secrets = {name: os.getenv(name, dotenv.get(name)) for name in names}
+        missing = [name for name, value in secrets.items() if value is None]
+        if missing:
+            raise LookupError(f"Secrets missing from the environment and .env: {', '.join(missing)}")
+        return secrets
+
+
+class FileSecretProvider(SecretProvider):
+    """One file per secret in a mounted directory, e.g. Docker or Kubernetes secrets."""
+
+    name = "file"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def fetch(self, names: Iterable[str]) -> dict[str, str]:
+        return {name: (self.directory / name).read_text().strip() for name in names}
+
+
+class EncryptedSecretCache(SecretProvider):
+    """
+    Keeps the secrets of another provider in a Fernet-encrypted file for
+    `ttl_seconds`, so warm restarts skip the remote fetch. The file is only
+    readable by the current user and is ignored once expired.
+    """
+
+    def __init__(self, provider: SecretProvider, path: str, key: str, ttl_seconds: int):
+        self.provider = provider
+        self.name = f"{provider.name} (cached)"
+        self.path = Path(path)
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+
+    def fetch(self, names: Iterable[str]) -> dict[str, str]:
+        from cryptography.fernet import Fernet, InvalidToken
+
+        names = list(names)
+        fernet = Fernet(self.key)
+        try:
+            cached = json.loads(fernet.decrypt(self.path.read_bytes(), ttl=self.ttl_seconds))
+            if all(name in cached for name in names):
+                return {name: cached[name] for name in names}
+        except (OSError, InvalidToken, ValueError):
+            pass
+
+        secrets = self.provider.fetch(names)
+        try:
+            self.path.touch(mode=0o600, exist_ok=True)
+            self.path.write_bytes(fernet.encrypt(json.dumps(secrets).encode("utf-8")))
+        except OSError as e:
+            logger.warning(f"Failed to write secrets cache {self.path}: {str(e)}")
+        return secrets
+
 
 class Settings(BaseSettings):
     # Redis settings
     REDIS_HOST: str = os.getenv("REDIS_HOST")
     REDIS_PORT: int = os.getenv("REDIS_PORT")
     REDIS_USERNAME: str = os.getenv("REDIS_USERNAME")
-    REDIS_PASSWORD: str = ""
 
     @property
     def REDIS_URL(self):
@@ -18,11 +123,51 @@ class Settings(BaseSettings):
             f"@{self.REDIS_HOST}:{self.REDIS_PORT}"
         )
 
+    # Feed cache settings
+    FEED_CACHE_ENABLED: bool = os.getenv("FEED_CACHE_ENABLED", True)
+    FEED_CACHE_TTL_SECONDS: int = os.getenv("FEED_CACHE_TTL_SECONDS", 300)
+
+    # Cache the next page of a feed in the background while the client reads the current one
+    FEED_PREFETCH_ENABLED: bool = os.getenv("FEED_PREFETCH_ENABLED", False)
+
+    # Search score added per day of publication date, favouring recent articles among similar matches
+    SEARCH_RECENCY_WEIGHT: float = os.getenv("SEARCH_RECENCY_WEIGHT", 0.1)
+    # Results of a search are ranked once and paged from a snapshot kept in Redis
+    SEARCH_MAX_RESULTS: int = os.getenv("SEARCH_MAX_RESULTS", 500)
+    SEARCH_SNAPSHOT_TTL_SECONDS: int = os.getenv("SEARCH_SNAPSHOT_TTL_SECONDS", 900)
+
+    CATEGORY_REGISTRY_CHECK_SECONDS: int = os.getenv("CATEGORY_REGISTRY_CHECK_SECONDS", 30)
+
+    # Authenticated principal cache settings
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 300)
+    PRINCIPAL_CACHE_REDIS_ENABLED: bool = os.getenv("PRINCIPAL_CACHE_REDIS_ENABLED", False)
+
+    # Password hashing pool settings
+    PASSWORD_HASH_WORKERS: int = os.getenv("PASSWORD_HASH_WORKERS", 2)
+    PASSWORD_HASH_MAX_PENDING: int = os.getenv("PASSWORD_HASH_MAX_PENDING", 16)
+    PASSWORD_HASH_USE_PROCESSES: bool = os.getenv("PASSWORD_HASH_USE_PROCESSES", True)
+
     # DB settings
     DB_HOST: str = os.getenv("DB_HOST")
     DB_USER: str = os.getenv("DB_USER")
     DB_NAME: str = os.getenv("DB_NAME")
-    DB_PASSWORD: str = ""
+
+    # Connection budget shared by every process of the deployment
+    DB_MAX_CONNECTIONS: int = os.getenv("DB_MAX_CONNECTIONS", 40)
+    DB_CELERY_CONNECTIONS: int = os.getenv("DB_CELERY_CONNECTIONS", 6)
+    DB_POOL_TIMEOUT_SECONDS: float = os.getenv("DB_POOL_TIMEOUT_SECONDS", 10)
+    # "web" for API processes, "worker" for the Celery worker
+    DB_POOL_ROLE: str = os.getenv("DB_POOL_ROLE", "web")
+    # Optional read replicas for the feed endpoints: "host[:port][/database]", comma separated
+    DB_REPLICA_HOSTS: str = os.getenv("DB_REPLICA_HOSTS", "")
+    DB_REPLICA_MAX_LAG_SECONDS: float = os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 5)
+    DB_REPLICA_CHECK_SECONDS: float = os.getenv("DB_REPLICA_CHECK_SECONDS", 10)
+    # Use replicas whose lag cannot be read, e.g. a second local database that does not replicate
+    DB_REPLICA_ALLOW_UNKNOWN_LAG: bool = os.getenv("DB_REPLICA_ALLOW_UNKNOWN_LAG", False)
+    DB_READ_YOUR_WRITES_SECONDS: float = os.getenv("DB_READ_YOUR_WRITES_SECONDS", 5)
+    # API processes started by serve.py; 0 means one per available core
+    WEB_CONCURRENCY: int = os.getenv("WEB_CONCURRENCY", 0)
 
     @property
     def DB_URL(self):
@@ -31,34 +176,102 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}/{self.DB_NAME}"
         )
 
+    @property
+    def ASYNC_DB_URL(self):
+        return (
+            f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}"
+            f"@{self.DB_HOST}/{self.DB_NAME}"
+        )
+
     SCRAPER_SERVICE_URL: str = os.getenv("SCRAPER_SERVICE_URL")
     ML_INFERENCE_SERVICE_URL: str = os.getenv("ML_INFERENCE_SERVICE_URL")
     SCHEDULER_AUDIENCE: str = os.getenv("SCHEDULER_AUDIENCE")
+    SCHEDULER_JWKS_URL: str = os.getenv("SCHEDULER_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
     SERVICE_ACCOUNT: str = os.getenv("SERVICE_ACCOUNT")
     PROJECT_ID: str = os.getenv("PROJECT_ID")
 
-    JWT_ACCESS_SECRET = ""
-    JWT_REFRESH_SECRET = ""
+    # Outbound HTTP client settings
+    HTTP_MAX_CONNECTIONS: int = os.getenv("HTTP_MAX_CONNECTIONS", 20)
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10)
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", 60)
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", False)
+
+    # Ingestion pipeline settings
+    SCRAPER_PAGE_SIZE: int = os.getenv("SCRAPER_PAGE_SIZE", 25)
+    SCRAPER_MAX_PAGES: int = os.getenv("SCRAPER_MAX_PAGES", 1)
+    INGEST_ML_CHUNK_SIZE: int = os.getenv("INGEST_ML_CHUNK_SIZE", 25)
+    INGEST_ML_CONCURRENCY: int = os.getenv("INGEST_ML_CONCURRENCY", 4)
+    INGEST_ML_TIMEOUT_SECONDS: int = os.getenv("INGEST_ML_TIMEOUT_SECONDS", 60)
+
+    # Secret loading settings: secretmanager, env or file
+    SECRETS_PROVIDER: str = os.getenv("SECRETS_PROVIDER", "secretmanager")
+    SECRETS_DIR: str = os.getenv("SECRETS_DIR", "/run/secrets")
+    SECRETS_CACHE_PATH: Optional[str] = os.getenv("SECRETS_CACHE_PATH")
+    SECRETS_CACHE_KEY: Optional[str] = os.getenv("SECRETS_CACHE_KEY")
+    SECRETS_CACHE_TTL_SECONDS: int = os.getenv("SECRETS_CACHE_TTL_SECONDS", 300)
+
+    # Secrets are loaded together, concurrently, on first access
+    @property
+    def REDIS_PASSWORD(self):
+        return get_secret("REDIS_PASSWORD")
+
+    @property
+    def DB_PASSWORD(self):
+        return get_secret("DB_PASSWORD")
+
+    @property
+    def JWT_ACCESS_SECRET(self):
+        return get_secret("JWT_ACCESS_SECRET")
+
+    @property
+    def JWT_REFRESH_SECRET(self):
+        return get_secret("JWT_REFRESH_SECRET")
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
 
-def get_settings():
-    s = Settings()
-    client = secretmanager.SecretManagerServiceClient()
+def get_secret_provider(s: Settings) -> SecretProvider:
+    if s.SECRETS_PROVIDER == "env":
+        provider = EnvSecretProvider()
+    elif s.SECRETS_PROVIDER == "file":
+        provider = FileSecretProvider(s.SECRETS_DIR)
+    else:
+        provider = SecretManagerProvider(project_id=s.PROJECT_ID)
+
+    if s.SECRETS_CACHE_PATH and s.SECRETS_CACHE_KEY:
+        provider = EncryptedSecretCache(
+            provider,
+            path=s.SECRETS_CACHE_PATH,
+            key=s.SECRETS_CACHE_KEY,
+            ttl_seconds=s.SECRETS_CACHE_TTL_SECONDS
+        )
+    return provider
+
 
-    def get_secret(name: str, version: str) -> str:
-        secret_name = f"projects/{s.PROJECT_ID}/secrets/{name}/versions/{version}"
-        return client.access_secret_version(name=secret_name).payload.data.decode("UTF-8")
+_secrets: Optional[dict[str, str]] = None
+_secrets_lock = threading.Lock()
 
-    s.REDIS_PASSWORD = get_secret("REDIS_PASSWORD", "1")
-    s.DB_PASSWORD = get_secret("DB_PASSWORD", "1")
-    s.JWT_ACCESS_SECRET = get_secret("JWT_ACCESS_SECRET", "1")
-    s.JWT_REFRESH_SECRET = get_secret("JWT_REFRESH_SECRET", "1")
 
-    return s
+def get_secret(name: str) -> str:
+    """Return a secret, loading every application secret on the first call."""
+    global _secrets
+    if _secrets is None:
+        with _secrets_lock:
+            if _secrets is None:
+                provider = get_secret_provider(settings)
+                started = time.perf_counter()
+                _secrets = provider.fetch(SECRET_NAMES)
+                logger.info(
+                    f"Loaded {len(_secrets)} secrets from {provider.name} "
+                    f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+                )
+    return _secrets[name]
+
+
+def get_settings():
+    return Settings()
 
 
 settings = get_settings()
@@ -1,23 +1,72 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from core.settings import settings
+from db.pool_sizing import pool_config, web_worker_count
 
-SQLALCHEMY_DATABASE_URL = settings.DB_URL
+# The password is passed per connection (see below), so building the engines
+# at import does not wait on the secret store
+SQLALCHEMY_DATABASE_URL = URL.create(
+    "mysql+pymysql", username=settings.DB_USER, host=settings.DB_HOST, database=settings.DB_NAME
+)
+SQLALCHEMY_ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.set(drivername="mysql+aiomysql")
 
+# This process's share of the deployment-wide connection budget
+POOL_CONFIG = pool_config(
+    role=settings.DB_POOL_ROLE,
+    max_connections=settings.DB_MAX_CONNECTIONS,
+    celery_connections=settings.DB_CELERY_CONNECTIONS,
+    web_workers=web_worker_count(settings.WEB_CONCURRENCY, settings.DB_MAX_CONNECTIONS, settings.DB_CELERY_CONNECTIONS),
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+)
+
+# Sync engine: used by the Celery worker
 pool = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_size=3,
-    max_overflow=2,
     pool_pre_ping=True,
+    **POOL_CONFIG["sync"],
+)
+
+# Async engine: used by the read endpoints, waiting on it does not hold a threadpool slot
+async_pool = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    **POOL_CONFIG["async"],
 )
 
+
+def provide_password(engine):
+    """Pass the DB password to every new connection of `engine`."""
+    @event.listens_for(engine, "do_connect")
+    def _set_password(dialect, conn_rec, cargs, cparams):
+        cparams["password"] = settings.DB_PASSWORD
+
+
+provide_password(pool)
+provide_password(async_pool.sync_engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=pool)
 
+AsyncSessionLocal = async_sessionmaker(bind=async_pool, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
+def pool_status() -> dict:
+    """Configured sizes and current usage of this process's connection pools."""
+    return {
+        "pid": os.getpid(),
+        **POOL_CONFIG,
+        "sync_status": pool.pool.status(),
+        "async_status": async_pool.pool.status(),
+    }
+
+
 # Dependency to get a session
 def get_db():
     """
@@ -28,3 +77,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency to get an async db session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
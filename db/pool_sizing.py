@@ -0,0 +1,96 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Below this an API process cannot serve a request while another one holds a connection
+MIN_WEB_WORKER_CONNECTIONS = 2
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on, honouring affinity limits."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def web_worker_count(configured: int, max_connections: int, celery_connections: int) -> int:
+    """
+    Number of API processes: `configured` when set, otherwise one per core, but
+    never more than the connection budget left after the Celery worker allows
+    for. Raises ValueError when the budget cannot serve the configured count.
+    """
+    limit = (max_connections - celery_connections) // MIN_WEB_WORKER_CONNECTIONS
+    if limit < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={max_connections} leaves fewer than {MIN_WEB_WORKER_CONNECTIONS} connections "
+            f"for the API after the {celery_connections} reserved for Celery"
+        )
+    if configured > 0:
+        if configured > limit:
+            raise ValueError(
+                f"WEB_CONCURRENCY={configured} needs at least {configured * MIN_WEB_WORKER_CONNECTIONS} connections "
+                f"besides Celery's, DB_MAX_CONNECTIONS={max_connections} allows at most {limit} API processes"
+            )
+        return configured
+
+    cores = available_cores()
+    if cores > limit:
+        logger.warning(f"Starting {limit} API processes instead of one per core ({cores}), see DB_MAX_CONNECTIONS")
+    return min(cores, limit)
+
+
+def split_connections(connections: int, pool_timeout: float) -> dict:
+    """
+    Engine keyword arguments for a pool allowed `connections` connections in
+    total. Two thirds are kept open, the rest is overflow opened on demand.
+    """
+    connections = max(connections, 1)
+    pool_size = max(connections - connections // 3, 1)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": connections - pool_size,
+        "pool_timeout": pool_timeout,
+    }
+
+
+def pool_config(
+        role: str,
+        max_connections: int,
+        celery_connections: int,
+        web_workers: int,
+        pool_timeout: float
+) -> dict:
+    """
+    Sizes of the sync and async pools of one process, derived from the total
+    connection budget of the deployment.
+
+    :param role: "web" for an API worker process, "worker" for the Celery worker
+    :param max_connections: connections the database may receive from the whole deployment
+    :param celery_connections: part of the budget reserved for the Celery worker
+    :param web_workers: number of API processes sharing the rest of the budget
+    :param pool_timeout: seconds to wait for a free connection before failing
+    """
+    if role == "worker":
+        # Ingestion only uses the sync engine
+        return {
+            "role": role,
+            "sync": split_connections(celery_connections, pool_timeout),
+            "async": split_connections(1, pool_timeout),
+        }
+
+    per_process = (max_connections - celery_connections) // max(web_workers, 1)
+    if per_process < MIN_WEB_WORKER_CONNECTIONS:
+        raise ValueError(
+            f"{web_workers} API processes cannot share {max_connections - celery_connections} connections, "
+            f"each needs at least {MIN_WEB_WORKER_CONNECTIONS}"
+        )
+    # Every route uses the async engine. The sync one is only used by Celery,
+    # API processes never open its connection, so it is left out of the budget
+    return {
+        "role": role,
+        "web_workers": web_workers,
+        "sync": split_connections(1, pool_timeout),
+        "async": split_connections(per_process, pool_timeout),
+    }
@@ -0,0 +1,190 @@
+import asyncio
+import contextlib
+import logging
+import random
+import time
+from typing import AsyncIterator, Optional
+
+import redis
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from core.settings import settings
+from db.base import AsyncSessionLocal, POOL_CONFIG, SQLALCHEMY_ASYNC_DATABASE_URL, provide_password
+from services.redis_client import get_redis, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_KEY = "db:recent-write"
+
+
+def parse_replica_hosts(value: str) -> list[tuple[str, Optional[int], str]]:
+    """Parse `host[:port][/database]` entries separated by commas."""
+    replicas = []
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        address, _, database = entry.partition("/")
+        host, _, port = address.partition(":")
+        replicas.append((host, int(port) if port else None, database or settings.DB_NAME))
+    return replicas
+
+
+class Replica:
+    def __init__(self, host: str, port: Optional[int], database: str):
+        self.name = f"{host}:{port or 3306}/{database}"
+        self.engine: AsyncEngine = create_async_engine(
+            SQLALCHEMY_ASYNC_DATABASE_URL.set(host=host, port=port, database=database),
+            pool_pre_ping=True,
+            **POOL_CONFIG["async"],
+        )
+        provide_password(self.engine.sync_engine)
+        self.sessionmaker = async_sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        self.healthy = True
+        self.lag: Optional[float] = None
+
+
+class ReplicaRouter:
+    """
+    Sends feed reads to read replicas and everything else to the primary.
+    Replicas are probed every `check_interval` seconds and skipped while they
+    are unreachable, more than `max_lag` seconds behind, or their lag cannot be
+    read, unless `allow_unknown_lag` is set. For
+    `read_your_writes` seconds after a committed write, announced through
+    Redis so it covers every process, reads go to the primary too.
+    """
+
+    def __init__(
+            self,
+            replicas: list[Replica],
+            max_lag: float,
+            read_your_writes: float,
+            check_interval: float,
+            allow_unknown_lag: bool = False
+    ):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.allow_unknown_lag = allow_unknown_lag
+        self.read_your_writes = read_your_writes
+        self.check_interval = check_interval
+        self._checker: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    async def start(self):
+        if self.enabled:
+            await self.check()
+            self._checker = asyncio.create_task(self._check_periodically())
+
+    async def stop(self):
+        if self._checker is not None:
+            self._checker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._checker
+            self._checker = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def check(self):
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica):
+        try:
+            async with replica.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                try:
+                    status = (await connection.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+                except ProgrammingError as e:
+                    # Older server or no REPLICATION CLIENT privilege
+                    logger.debug(f"Cannot read replication status of {replica.name}: {str(e)}")
+                    status = None
+        except DBAPIError as e:
+            if replica.healthy:
+                logger.warning(f"Read replica {replica.name} is unavailable: {str(e)}")
+            replica.healthy = False
+            return
+
+        if status is None:
+            # Not replicating or the status cannot be read: how far behind it is is unknown
+            lag = None
+            healthy = self.allow_unknown_lag
+        else:
+            # A stopped replication thread reports no lag at all
+            lag = status.get("Seconds_Behind_Source")
+            healthy = lag is not None and lag <= self.max_lag
+        replica.lag = lag
+        if healthy != replica.healthy:
+            logger.warning(
+                f"Read replica {replica.name} {'is back' if healthy else 'is lagging'} "
+                f"(lag: {'unknown' if lag is None else lag})"
+            )
+        replica.healthy = healthy
+
+    async def _check_periodically(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    def record_write(self):
+        """Mark that the primary was just written to. Call after the commit."""
+        if not self.enabled:
+            return
+        try:
+            get_redis().set(LAST_WRITE_KEY, int(time.time()), px=int(self.read_your_writes * 1000))
+        except redis.RedisError as e:
+            logger.error(f"Failed to record primary write: {str(e)}")
+
+    async def _recently_written(self) -> bool:
+        try:
+            return bool(await get_async_redis().exists(LAST_WRITE_KEY))
+        except redis.RedisError as e:
+            logger.warning(f"Recent write check failed, reading from the primary: {str(e)}")
+            return True
+
+    async def pick(self) -> Optional[Replica]:
+        """A healthy replica to read from, or None to use the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy or await self._recently_written():
+            return None
+        return random.choice(healthy)
+
+    def status(self) -> list[dict]:
+        return [{"name": r.name, "healthy": r.healthy, "lag": r.lag} for r in self.replicas]
+
+
+replica_router = ReplicaRouter(
+    replicas=[Replica(*replica) for replica in parse_replica_hosts(settings.DB_REPLICA_HOSTS)],
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    read_your_writes=settings.DB_READ_YOUR_WRITES_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_SECONDS,
+    allow_unknown_lag=settings.DB_REPLICA_ALLOW_UNKNOWN_LAG,
+)
+
+
+@contextlib.asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """An async session for feed reads, on a read replica when one is configured and usable."""
+    replica = await replica_router.pick()
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with replica.sessionmaker() as db:
+        try:
+            yield db
+        except DBAPIError as e:
+            if isinstance(e, OperationalError) or e.connection_invalidated:
+                # Stop routing here until the next successful check
+                replica.healthy = False
+            raise
+
+
+async def get_read_db():
+    """
+    Dependency to get an async db session for feed reads, bound to a read
+    replica when one is configured and usable
+    """
+    async with read_session() as db:
+        yield db
@@ -1,15 +1,42 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from api.v1 import user, news, scheduler
-from db.base import Base, pool
+from api.v1 import user, news, scheduler, metrics, export, stream
+from core.principal_cache import principal_cache
+from core.security import password_hashing_executor
+from db.base import POOL_CONFIG
+from db.replicas import replica_router
+from services.article_events import article_event_hub
+from services.gcloud_oidc_auth import jwks_provider
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    logger.info(f"DB pool configuration: {POOL_CONFIG}")
+    password_hashing_executor.start()
+    await jwks_provider.start()
+    await principal_cache.start()
+    await replica_router.start()
+    yield
+    await article_event_hub.stop()
+    await replica_router.stop()
+    await principal_cache.stop()
+    await jwks_provider.stop()
+    password_hashing_executor.shutdown()
 
-app = FastAPI()
 
-Base.metadata.create_all(bind=pool)
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(user.router)
 app.include_router(news.router)
 app.include_router(scheduler.router)
+app.include_router(metrics.router)
+app.include_router(export.router)
+app.include_router(stream.router)
 
 
 @app.get("/")
@@ -0,0 +1,105 @@
+"""Baseline schema, as previously created by Base.metadata.create_all
+
+Databases created before migrations were introduced already have these
+tables. Upgrading them leaves the tables as they are and only records the
+revision, so `alembic upgrade head` works on new and existing databases.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BASELINE_TABLES = ('sources', 'categories', 'articles', 'trending', 'users')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names()) & set(BASELINE_TABLES)
+    if existing == set(BASELINE_TABLES):
+        # Created by Base.metadata.create_all before migrations were introduced
+        return
+    if existing:
+        raise RuntimeError(
+            f"Only some of the baseline tables exist ({', '.join(sorted(existing))}); "
+            "repair the schema before migrating"
+        )
+
+    op.create_table(
+        'sources',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=True),
+        sa.Column('logo_url', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sources_id', 'sources', ['id'])
+    op.create_index('ix_sources_name', 'sources', ['name'])
+
+    op.create_table(
+        'categories',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    op.create_index('ix_categories_id', 'categories', ['id'])
+
+    op.create_table(
+        'articles',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('uuid', sa.String(length=64), nullable=False),
+        sa.Column('title', sa.String(length=512), nullable=False),
+        sa.Column('url', sa.String(length=1024), nullable=False),
+        sa.Column('description', sa.String(length=1024), nullable=True),
+        sa.Column('url_to_image', sa.Text(), nullable=True),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('sentiment', sa.String(length=32), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['source_id'], ['sources.id']),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_articles_id', 'articles', ['id'])
+    op.create_index('ix_articles_uuid', 'articles', ['uuid'])
+    op.create_index('ix_articles_published_at', 'articles', ['published_at'])
+
+    op.create_table(
+        'trending',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('article_uuid', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['article_uuid'], ['articles.uuid']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_trending_id', 'trending', ['id'])
+
+    op.create_table(
+        'users',
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('hashed_password', sa.String(length=128), nullable=False),
+        sa.PrimaryKeyConstraint('email'),
+    )
+    op.create_index('ix_users_email', 'users', ['email'])
+    op.create_index('ix_users_name', 'users', ['name'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('users')
+    op.drop_table('trending')
+    op.drop_table('articles')
+    op.drop_table('categories')
+    op.drop_table('sources')
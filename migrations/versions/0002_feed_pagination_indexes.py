@@ -0,0 +1,37 @@
+"""Composite indexes for the keyset pagination feed queries
+
+Feed pages filter on category or sentiment and then walk `id` downwards
+from `last_item_id`; (filter, id) indexes let MySQL read each page as a
+single backward range scan instead of sorting the matching rows. The
+trending join looks articles up by `trending.article_uuid`, which had no
+index of its own.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_articles_category_id_id', 'articles', ['category_id', 'id'])
+    op.create_index('ix_articles_sentiment_id', 'articles', ['sentiment', 'id'])
+    op.create_index('ix_trending_article_uuid', 'trending', ['article_uuid'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trending_article_uuid', table_name='trending')
+    op.drop_index('ix_articles_sentiment_id', table_name='articles')
+    op.drop_index('ix_articles_category_id_id', table_name='articles')
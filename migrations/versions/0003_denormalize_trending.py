@@ -0,0 +1,62 @@
+"""Store trending membership and rank on articles and drop the trending table
+
+The trending feed used to join articles to an append-only `trending` table
+on a non-unique string uuid. Membership now lives in `articles.is_trending`,
+indexed together with `id` so the feed is a single index range scan, and
+ingestion replaces the whole set in one transaction.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('articles', sa.Column('is_trending', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('articles', sa.Column('trending_rank', sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE articles SET is_trending = TRUE "
+        "WHERE uuid IN (SELECT article_uuid FROM trending)"
+    )
+
+    op.create_index('ix_articles_is_trending_id', 'articles', ['is_trending', 'id'])
+    op.create_index('ix_articles_is_trending_sentiment_id', 'articles', ['is_trending', 'sentiment', 'id'])
+
+    op.drop_table('trending')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        'trending',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('article_uuid', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['article_uuid'], ['articles.uuid']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_trending_id', 'trending', ['id'])
+    op.create_index('ix_trending_article_uuid', 'trending', ['article_uuid'])
+
+    op.execute(
+        "INSERT INTO trending (article_uuid) "
+        "SELECT uuid FROM articles WHERE is_trending ORDER BY id"
+    )
+
+    op.drop_index('ix_articles_is_trending_sentiment_id', table_name='articles')
+    op.drop_index('ix_articles_is_trending_id', table_name='articles')
+    op.drop_column('articles', 'trending_rank')
+    op.drop_column('articles', 'is_trending')
@@ -0,0 +1,37 @@
+"""Make articles.uuid unique so ingestion can deduplicate on it
+
+Retried or overlapping ingestion runs could store the same story more than
+once. Existing duplicates are removed, keeping the oldest row of each uuid,
+before the plain uuid index is replaced by a unique one.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "DELETE duplicate FROM articles AS duplicate "
+        "JOIN articles AS original ON duplicate.uuid = original.uuid AND duplicate.id > original.id"
+    )
+    op.drop_index('ix_articles_uuid', table_name='articles')
+    op.create_index('ix_articles_uuid', 'articles', ['uuid'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_articles_uuid', table_name='articles')
+    op.create_index('ix_articles_uuid', 'articles', ['uuid'])
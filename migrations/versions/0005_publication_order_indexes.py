@@ -0,0 +1,48 @@
+"""Index the feeds in publication order
+
+Feeds now page on the (published_at, id) keyset instead of insertion id.
+The (filter, id) indexes are replaced by (filter, published_at, id) ones so
+every page is still a single backward range scan. The new category index
+is created first because the category_id foreign key needs one.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_articles_published_at_id', 'articles', ['published_at', 'id'])
+    op.create_index('ix_articles_category_id_published_at_id', 'articles', ['category_id', 'published_at', 'id'])
+    op.create_index('ix_articles_is_trending_published_at_id', 'articles', ['is_trending', 'published_at', 'id'])
+    op.create_index(
+        'ix_articles_is_trending_sentiment_published_at_id',
+        'articles',
+        ['is_trending', 'sentiment', 'published_at', 'id']
+    )
+    op.drop_index('ix_articles_category_id_id', table_name='articles')
+    op.drop_index('ix_articles_is_trending_id', table_name='articles')
+    op.drop_index('ix_articles_is_trending_sentiment_id', table_name='articles')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_articles_is_trending_sentiment_id', 'articles', ['is_trending', 'sentiment', 'id'])
+    op.create_index('ix_articles_is_trending_id', 'articles', ['is_trending', 'id'])
+    op.create_index('ix_articles_category_id_id', 'articles', ['category_id', 'id'])
+    op.drop_index('ix_articles_is_trending_sentiment_published_at_id', table_name='articles')
+    op.drop_index('ix_articles_is_trending_published_at_id', table_name='articles')
+    op.drop_index('ix_articles_category_id_published_at_id', table_name='articles')
+    op.drop_index('ix_articles_published_at_id', table_name='articles')
@@ -0,0 +1,36 @@
+"""Full-text index over article titles and descriptions for search
+
+/v1/search matches words in `title` and `description`. A FULLTEXT index lets
+MySQL answer those lookups from the index instead of scanning every row
+with LIKE.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_articles_title_description_fulltext',
+        'articles',
+        ['title', 'description'],
+        mysql_prefix='FULLTEXT'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_articles_title_description_fulltext', table_name='articles')
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index, Boolean, false
 from sqlalchemy.orm import relationship
 
 from db.base import Base
@@ -29,13 +29,15 @@ class Article(Base):
     __tablename__ = 'articles'
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    uuid = Column(String(64), index=True, nullable=False)
+    uuid = Column(String(64), index=True, unique=True, nullable=False)
     title = Column(String(512), nullable=False)
     url = Column(String(1024), nullable=False)
     description = Column(String(1024), nullable=True)
     url_to_image = Column(Text, nullable=True)
     published_at = Column(DateTime, index=True, default=datetime.now(timezone.utc), nullable=False)
     sentiment = Column(String(32), nullable=False)  # Positive, Negative
+    is_trending = Column(Boolean, default=False, server_default=false(), nullable=False)
+    trending_rank = Column(Integer, nullable=True)  # 1 is the top story of the current trending set
 
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
@@ -43,9 +45,14 @@ class Article(Base):
     source = relationship('Source', back_populates='articles')
     category = relationship('Category', back_populates='articles')
 
+    __table_args__ = (
+        # Keyset pagination: filter, then walk (published_at, id) downwards from the cursor
+        Index('ix_articles_published_at_id', 'published_at', 'id'),
+        Index('ix_articles_category_id_published_at_id', 'category_id', 'published_at', 'id'),
+        Index('ix_articles_sentiment_id', 'sentiment', 'id'),
+        Index('ix_articles_is_trending_published_at_id', 'is_trending', 'published_at', 'id'),
+        Index('ix_articles_is_trending_sentiment_published_at_id', 'is_trending', 'sentiment', 'published_at', 'id'),
+        # Search: MATCH (title, description) AGAINST (...)
+        Index('ix_articles_title_description_fulltext', 'title', 'description', mysql_prefix='FULLTEXT'),
+    )
 
-class Trending(Base):
-    __tablename__ = 'trending'
-
-    id = Column(Integer, primary_key=True, index=True)
-    article_uuid = Column(String(64), ForeignKey("articles.uuid"), nullable=False)
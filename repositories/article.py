@@ -1,22 +1,39 @@
-from typing import Optional, List
-
+from datetime import datetime
+from typing import AsyncIterator, Optional, List
+
+from pymysql.constants import ER
+from sqlalchemy import select, update, case, insert, bindparam, Row, Select, or_, and_, func, union_all, literal, true
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from models.news import Article, Trending, Category, Source
-from schemas.news import ArticleCreate, SourceCreate, CategoryCreate
-from utils.mapper import article_create_to_article
+from core.cursors import Keyset
+from db.replicas import replica_router
+from models.news import Article, Category, Source
+from schemas.news import ArticleCreate, SourceCreate, CategoryCreate, ArticleIngestionResult
+from services import feed_cache
+from services.category_registry import category_registry
+from utils.mapper import article_create_to_row
 
 
 def create_articles(
         db: Session,
         article_creates: List[ArticleCreate],
         categories_set: set[str],
-        sources_map: dict[str, str]
-):
+        sources_map: dict[str, str],
+        replace_trending: bool = True
+) -> ArticleIngestionResult:
     """
-    Create articles, their categories, and sources, and store them in the database. Also, handle the
-    creation of trending articles based on their properties, ensuring the relationships between
-    categories, sources, and articles are correctly established and persisted.
+    Create articles, their categories, and sources, and store them in the database, deduplicating on
+    the article uuid. Existing uuids are looked up in bulk first: articles whose sentiment and
+    category are unchanged are skipped, changed ones are updated in place, and only unseen uuids are
+    written, with a single Core executemany INSERT backed by the unique uuid index. Re-running
+    a batch therefore costs one query and writes nothing. Articles another ingestion inserted in the
+    meantime count as skipped, not inserted. When the batch flags trending articles,
+    they atomically replace the current trending set, ranked in batch order, unless
+    `replace_trending` is False, e.g. for chunks of a larger run that sets the trending set once
+    through `set_trending_articles`.
 
     :param db: Database session object used for database operations.
     :type db: Session
@@ -28,83 +45,478 @@ def create_articles(
     :param sources_map: Dictionary mapping source names to source URLs, defining sources for the
         articles to be created.
     :type sources_map: dict[str, str]
-    :return: List of newly created article objects after being committed to the database.
-    :rtype: List[Article]
+    :param replace_trending: Whether the batch's trending flags replace the current trending set.
+    :type replace_trending: bool
+    :return: Ids of the inserted (also grouped by category) and updated articles and the number of
+        skipped ones.
+    :rtype: ArticleIngestionResult
     """
+    unique_creates = list({article_in.uuid: article_in for article_in in article_creates}.values())
+    result = ArticleIngestionResult(skipped=len(article_creates) - len(unique_creates))
+    if not unique_creates:
+        return result
+
+    existing = _get_existing_articles(db, uuids=[article_in.uuid for article_in in unique_creates])
+
+    new_creates = []
+    changed_creates = []
+    for article_in in unique_creates:
+        existing_article = existing.get(article_in.uuid)
+        if existing_article is None:
+            new_creates.append(article_in)
+        elif (existing_article.sentiment, existing_article.category) != (article_in.sentiment, article_in.category):
+            changed_creates.append(article_in)
+        else:
+            result.skipped += 1
+
+    if not new_creates and not changed_creates:
+        return result
+
     db_categories = create_categories_from_names(db=db, names=categories_set)
     db_sources = create_sources_from_dict(db=db, sources=sources_map)
 
     category_name_to_id = {category.name: category.id for category in db_categories}
     source_name_to_id = {source.name: source.id for source in db_sources}
 
-    db_articles = []
-    trending_articles = []
+    trending_ranks = _rank_uuids(
+        [article_in.uuid for article_in in unique_creates if article_in.is_trending]
+    ) if replace_trending else {}
+    if trending_ranks:
+        _clear_trending_set(db)
+
+    if new_creates:
+        article_rows = {
+            article_in.uuid: article_create_to_row(
+                article_in,
+                category_id=category_name_to_id.get(article_in.category),
+                source_id=source_name_to_id.get(article_in.source.name),
+                trending_rank=trending_ranks.get(article_in.uuid)
+            )
+            for article_in in new_creates
+        }
+        inserted_uuids = _insert_new_articles(db, article_rows=article_rows)
+        result.skipped += len(article_rows) - len(inserted_uuids)
+        article_ids = _get_article_ids_by_uuid(db, uuids=inserted_uuids)
+        for article_in in new_creates:
+            if article_in.uuid in article_ids:
+                result.inserted_ids.append(article_ids[article_in.uuid])
+                result.inserted_by_category.setdefault(article_in.category, []).append(article_ids[article_in.uuid])
+
+    if changed_creates:
+        db.execute(
+            update(Article.__table__)
+            .where(Article.id == bindparam("article_id"))
+            .values(sentiment=bindparam("new_sentiment"), category_id=bindparam("new_category_id")),
+            [
+                {
+                    "article_id": existing[article_in.uuid].id,
+                    "new_sentiment": article_in.sentiment,
+                    "new_category_id": category_name_to_id.get(article_in.category),
+                }
+                for article_in in changed_creates
+            ]
+        )
+        result.updated_ids = [existing[article_in.uuid].id for article_in in changed_creates]
+
+    existing_trending = {uuid: rank for uuid, rank in trending_ranks.items() if uuid in existing}
+    if existing_trending:
+        _mark_trending(db, ranks=existing_trending)
 
-    for article_in in article_creates:
-        category_id = category_name_to_id.get(article_in.category)
-        source_id = source_name_to_id.get(article_in.source.name)
+    db.commit()
+    replica_router.record_write()
+    category_registry.register(category_name_to_id)
 
-        db_articles.append(article_create_to_article(article_in, category_id, source_id))
+    # Updated articles may be trending, and the trending feed shows and filters on their sentiment
+    if trending_ranks or changed_creates:
+        feed_cache.bump_generation(feed_cache.CATEGORY_FEED, feed_cache.TRENDING_FEED)
+    else:
+        feed_cache.bump_generation(feed_cache.CATEGORY_FEED)
 
-    db.add_all(db_articles)
-    db.flush()
-    for article_in in article_creates:
-        if article_in.is_trending:
-            trending_articles.append(Trending(article_uuid=article_in.uuid))
+    return result
 
-    db.add_all(trending_articles)
-    db.commit()
-    for article in db_articles:
-        db.refresh(article)
-    return db_articles
 
+def _get_existing_articles(db: Session, uuids: List[str]) -> dict[str, Row]:
+    """Look up id, sentiment and category name of already stored articles by uuid, in one query."""
+    rows = db.execute(
+        select(Article.uuid, Article.id, Article.sentiment, Category.name.label("category"))
+        .join(Category, Article.category_id == Category.id)
+        .where(Article.uuid.in_(uuids))
+    ).all()
+    return {row.uuid: row for row in rows}
 
-def get_category_articles(
-        db: Session,
-        last_item_id: int = None,
-        category: Optional[str] = None,
+
+def _insert_new_articles(db: Session, article_rows: dict[str, dict], attempts: int = 3) -> List[str]:
+    """
+    Insert article rows keyed by uuid and return the uuids this call actually
+    inserted. When another ingestion inserted some of them since they were
+    looked up, the statement fails on the unique uuid index, is rolled back to a
+    savepoint and repeated without the uuids a locking read, which sees them
+    whatever the isolation level, now finds. Any other error, and a duplicate
+    key the locking read cannot explain, is raised.
+    """
+    article_rows = dict(article_rows)
+    for _ in range(attempts):
+        if not article_rows:
+            return []
+        savepoint = db.begin_nested()
+        try:
+            db.execute(insert(Article.__table__), list(article_rows.values()))
+        except IntegrityError as e:
+            savepoint.rollback()
+            if not _is_duplicate_key(e):
+                raise
+            taken = set(db.execute(
+                select(Article.uuid).where(Article.uuid.in_(article_rows)).with_for_update(read=True)
+            ).scalars())
+            if not taken:
+                raise
+            for uuid in taken:
+                del article_rows[uuid]
+            continue
+        savepoint.commit()
+        return list(article_rows)
+    raise RuntimeError(f"Articles kept being inserted concurrently after {attempts} attempts")
+
+
+def _is_duplicate_key(error: IntegrityError) -> bool:
+    """Whether MySQL rejected the statement for a duplicate unique key (ER_DUP_ENTRY)."""
+    return bool(error.orig.args) and error.orig.args[0] == ER.DUP_ENTRY
+
+
+def _get_article_ids_by_uuid(db: Session, uuids: List[str]) -> dict[str, int]:
+    """Map uuids to article ids with one query."""
+    rows = db.execute(select(Article.uuid, Article.id).where(Article.uuid.in_(uuids))).all()
+    return {uuid: article_id for uuid, article_id in rows}
+
+
+def _feed_select():
+    """
+    The columns of a feed entry, with source and category joined into the page
+    query. Rows are plain tuples, serialized by `utils.mapper.article_row_to_response`
+    without building ORM objects or pydantic models.
+    """
+    return (
+        select(
+            Article.id,
+            Article.title,
+            Article.url,
+            Article.description,
+            Article.url_to_image,
+            Article.published_at,
+            Article.sentiment,
+            Source.id.label("source_id"),
+            Source.name.label("source_name"),
+            Source.logo_url.label("source_logo_url"),
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+        )
+        .join(Source, Article.source_id == Source.id)
+        .join(Category, Article.category_id == Category.id)
+    )
+
+
+def _after(keyset: Keyset):
+    """Rows after `keyset` in feed order, i.e. (published_at, id) below it."""
+    published_at, article_id = keyset
+    return or_(
+        Article.published_at < published_at,
+        and_(Article.published_at == published_at, Article.id < article_id),
+    )
+
+
+def _feed_order():
+    return Article.published_at.desc(), Article.id.desc()
+
+
+async def get_article_keyset(db: AsyncSession, article_id: int) -> Optional[Keyset]:
+    """The feed position of an article, for clients still paging with `last_item_id`."""
+    row = (await db.execute(select(Article.published_at, Article.id).where(Article.id == article_id))).first()
+    return (row.published_at, row.id) if row is not None else None
+
+
+def category_feed_query(
+        after: Optional[Keyset] = None,
+        category_id: Optional[int] = None,
         page_size: int = 25
-) -> list[Article]:
-    """Fetch articles, optionally filtered by category and paginated."""
-    query = db.query(Article).order_by(Article.id.desc())
+) -> Select:
+    """The query behind `get_category_articles`, for combining feeds with `get_feed_sections`."""
+    query = _feed_select().order_by(*_feed_order())
 
-    if category is not None and category != "all":
-        query = query.filter(Article.category.has(name=category))
+    if category_id is not None:
+        query = query.where(Article.category_id == category_id)
 
-    if last_item_id is not None:
-        query = query.filter(Article.id < last_item_id)
+    if after is not None:
+        query = query.where(_after(after))
 
-    articles = query.limit(page_size).all()
-    return articles if articles else []
+    return query.limit(page_size)
 
 
-def get_trending_articles(
-        db: Session,
-        last_item_id: Optional[int] = None,
+async def get_category_articles(
+        db: AsyncSession,
+        after: Optional[Keyset] = None,
+        category_id: Optional[int] = None,
+        page_size: int = 25
+) -> list[Row]:
+    """
+    Fetch feed rows newest first, optionally filtered by category, continuing
+    after the `after` keyset. Category names are resolved to ids through the
+    category registry by the caller.
+    """
+    query = category_feed_query(after=after, category_id=category_id, page_size=page_size)
+    return list((await db.execute(query)).all())
+
+
+def multi_category_feed_query(
+        category_ids: List[int],
+        after: Optional[Keyset] = None,
+        page_size: int = 25
+) -> Select:
+    """The query behind `get_multi_category_articles`."""
+    if len(category_ids) == 1:
+        return category_feed_query(after=after, category_id=category_ids[0], page_size=page_size)
+
+    per_category = []
+    for category_id in category_ids:
+        query = (
+            select(Article.id)
+            .where(Article.category_id == category_id)
+            .order_by(*_feed_order())
+            .limit(page_size)
+        )
+        if after is not None:
+            query = query.where(_after(after))
+        per_category.append(query.subquery().select())
+    candidates = union_all(*per_category).subquery()
+
+    return (
+        _feed_select()
+        .join(candidates, candidates.c.id == Article.id)
+        .order_by(*_feed_order())
+        .limit(page_size)
+    )
+
+
+async def get_multi_category_articles(
+        db: AsyncSession,
+        category_ids: List[int],
+        after: Optional[Keyset] = None,
+        page_size: int = 25
+) -> list[Row]:
+    """
+    Fetch one feed page merged from several categories, newest first. Each
+    category contributes at most `page_size` ids from its own
+    (category_id, published_at, id) index range; the union of those is
+    sorted once, so the database never sorts more than
+    `len(category_ids) * page_size` rows however large the categories are.
+    """
+    query = multi_category_feed_query(category_ids, after=after, page_size=page_size)
+    return list((await db.execute(query)).all())
+
+
+def trending_feed_query(
+        after: Optional[Keyset] = None,
         omit_negative_sentiment: bool = False,
         page_size: int = 25
-) -> list[Article]:
-    """Fetch trending articles, paginated."""
+) -> Select:
+    """The query behind `get_trending_articles`, for combining feeds with `get_feed_sections`."""
     query = (
-        db.query(Article)
-        .join(Trending, Article.uuid == Trending.article_uuid)
-        .order_by(Article.id.desc())
+        _feed_select()
+        .where(Article.is_trending == true())
+        .order_by(*_feed_order())
     )
 
-    if last_item_id is not None:
-        query = query.filter(Article.id < last_item_id)
+    if after is not None:
+        query = query.where(_after(after))
 
     if omit_negative_sentiment:
-        query = query.filter(Article.sentiment == "positive")
+        query = query.where(Article.sentiment == "positive")
+
+    return query.limit(page_size)
 
-    articles = query.limit(page_size).all()
-    return articles if articles else []
+
+async def get_trending_articles(
+        db: AsyncSession,
+        after: Optional[Keyset] = None,
+        omit_negative_sentiment: bool = False,
+        page_size: int = 25
+) -> list[Row]:
+    """Fetch trending feed rows newest first, continuing after the `after` keyset."""
+    query = trending_feed_query(after=after, omit_negative_sentiment=omit_negative_sentiment, page_size=page_size)
+    return list((await db.execute(query)).all())
+
+
+async def get_feed_sections(db: AsyncSession, queries: List[Select]) -> list[list[Row]]:
+    """
+    Run several feed queries as a single UNION ALL statement and return the
+    rows of each, in feed order, with a trailing `section` column. Used to load every section of a screen in
+    one round trip on one connection.
+    """
+    if not queries:
+        return []
+    labelled = [
+        query.add_columns(literal(section).label("section")).subquery().select()
+        for section, query in enumerate(queries)
+    ]
+    sections = [[] for _ in queries]
+    for row in (await db.execute(union_all(*labelled))).all():
+        sections[row.section].append(row)
+    # UNION ALL does not keep the order of its parts
+    for rows in sections:
+        rows.sort(key=lambda row: (row.published_at, row.id), reverse=True)
+    return sections
+
+
+def search_query(terms: str, recency_weight: float = 0.1, limit: int = 500) -> Select:
+    """The query behind `search_article_ids`."""
+    relevance = match(Article.title, Article.description, against=terms).in_natural_language_mode()
+    score = relevance + recency_weight * func.unix_timestamp(Article.published_at) / 86400
+    return (
+        select(Article.id)
+        .where(relevance)
+        .order_by(score.desc(), Article.id.desc())
+        .limit(limit)
+    )
+
+
+async def search_article_ids(
+        db: AsyncSession,
+        terms: str,
+        recency_weight: float = 0.1,
+        limit: int = 500
+) -> List[int]:
+    """
+    Full-text search over titles and descriptions through the FULLTEXT index.
+    Returns the ids of up to `limit` matches ordered by score, the natural
+    language relevance plus `recency_weight` per day of `published_at`, so
+    newer articles win among similar matches. Relevance depends on the whole
+    corpus and shifts with every ingestion, so scores cannot key pages; rank
+    once and page through the returned ids with `get_articles_by_ids`.
+    """
+    query = search_query(terms, recency_weight=recency_weight, limit=limit)
+    return list((await db.execute(query)).scalars())
+
+
+async def get_articles_by_ids(db: AsyncSession, article_ids: List[int]) -> list[Row]:
+    """Feed rows of the given articles, in the order of `article_ids`; missing articles are left out."""
+    if not article_ids:
+        return []
+    rows = (await db.execute(_feed_select().where(Article.id.in_(article_ids)))).all()
+    position = {article_id: index for index, article_id in enumerate(article_ids)}
+    return sorted(rows, key=lambda row: position[row.id])
+
+
+def export_query(
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        sentiment: Optional[str] = None
+) -> Select:
+    """The query behind `stream_articles`."""
+    query = _feed_select().order_by(Article.published_at, Article.id)
+
+    if published_from is not None:
+        query = query.where(Article.published_at >= published_from)
+
+    if published_to is not None:
+        query = query.where(Article.published_at < published_to)
+
+    if category_id is not None:
+        query = query.where(Article.category_id == category_id)
+
+    if sentiment is not None:
+        query = query.where(Article.sentiment == sentiment)
+
+    return query
+
+
+async def stream_articles(
+        db: AsyncSession,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+        category_id: Optional[int] = None,
+        sentiment: Optional[str] = None,
+        batch_size: int = 1000
+) -> AsyncIterator[list[Row]]:
+    """
+    Stream feed rows oldest first in batches of `batch_size`, through a
+    server-side cursor, so memory use does not grow with the result size.
+    `published_to` is exclusive.
+    """
+    query = export_query(
+        published_from=published_from,
+        published_to=published_to,
+        category_id=category_id,
+        sentiment=sentiment
+    )
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for batch in result.partitions():
+        yield batch
+
+
+def _rank_uuids(ranked_uuids: List[str]) -> dict[str, int]:
+    """Assign 1-based trending ranks in order, keeping the first rank of repeated uuids."""
+    ranks = {}
+    for uuid in ranked_uuids:
+        ranks.setdefault(uuid, len(ranks) + 1)
+    return ranks
+
+
+def _clear_trending_set(db: Session):
+    db.execute(
+        update(Article)
+        .where(Article.is_trending == true())
+        .values(is_trending=False, trending_rank=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _mark_trending(db: Session, ranks: dict[str, int]):
+    db.execute(
+        update(Article)
+        .where(Article.uuid.in_(ranks))
+        .values(is_trending=True, trending_rank=case(ranks, value=Article.uuid))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def replace_trending_set(db: Session, ranked_uuids: List[str]):
+    """
+    Make the given articles the trending set, ranked in the given order, and
+    drop every other article from it. Runs in the caller's transaction, so
+    readers see either the old or the new set once it commits.
+    """
+    _clear_trending_set(db)
+    _mark_trending(db, ranks=_rank_uuids(ranked_uuids))
+
+
+def set_trending_articles(db: Session, ranked_uuids: List[str]) -> List[int]:
+    """Replace the trending set with the given articles and commit. Returns their ids in rank order."""
+    replace_trending_set(db, ranked_uuids=ranked_uuids)
+    db.commit()
+    replica_router.record_write()
+    feed_cache.bump_generation(feed_cache.TRENDING_FEED)
+    return get_trending_article_ids(db)
+
+
+def get_trending_article_ids(db: Session) -> List[int]:
+    """Ids of the current trending set, top story first."""
+    return list(db.execute(
+        select(Article.id)
+        .where(Article.is_trending == true())
+        .order_by(Article.trending_rank)
+    ).scalars())
 
 
 def remove_trending_article(db: Session, article_uuid: str):
     """Remove an article from trending."""
-    db.query(Trending).filter(article_uuid=article_uuid).delete()
+    db.execute(
+        update(Article)
+        .where(Article.uuid == article_uuid)
+        .values(is_trending=False, trending_rank=None)
+    )
     db.commit()
+    replica_router.record_write()
+    feed_cache.bump_generation(feed_cache.TRENDING_FEED)
 
 
 def create_category(db: Session, category_data: CategoryCreate) -> Category:
@@ -156,11 +568,6 @@ def get_categories_by_name(db: Session, names: set[str]) -> Optional[List[Catego
     return categories if categories else None
 
 
-def get_all_categories(db: Session):
-    """Retrieve all categories."""
-    return db.query(Category).all()
-
-
 def create_source(db: Session, source_data: SourceCreate) -> Source:
     """Insert a new news source into the database."""
     db_source = Source(**source_data.model_dump())
@@ -1,18 +1,53 @@
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from core.security import hash_password
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.principal_cache import principal_cache
+from core.security import hash_password_async
 from models.user import User
 from schemas.user import UserCreate
 
 
-def create_user(db: Session, user: UserCreate):
-    hashed_pw = hash_password(user.password)
+async def create_user(db: AsyncSession, user: UserCreate):
+    hashed_pw = await hash_password_async(user.password)
     db_user = User(email=user.email, name=user.name, hashed_password=hashed_pw)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    return db_user
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return await db.scalar(select(User).where(User.email == email))
+
+
+async def update_user(
+        db: AsyncSession,
+        email: str,
+        name: Optional[str] = None,
+        password: Optional[str] = None
+) -> Optional[User]:
+    """Update a user's name and/or password and evict their cached principals."""
+    db_user = await get_user_by_email(db, email)
+    if db_user is None:
+        return None
+
+    if name is not None:
+        db_user.name = name
+    if password is not None:
+        db_user.hashed_password = await hash_password_async(password)
+    await db.commit()
+    await principal_cache.invalidate_user(email)
     return db_user
 
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
+async def delete_user(db: AsyncSession, email: str) -> bool:
+    """Delete a user and evict their cached principals."""
+    db_user = await get_user_by_email(db, email)
+    if db_user is None:
+        return False
+
+    await db.delete(db_user)
+    await db.commit()
+    await principal_cache.invalidate_user(email)
+    return True
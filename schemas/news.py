@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict
 
 from pydantic import BaseModel
 
@@ -51,6 +51,17 @@ class ArticleResponse(BaseModel):
         from_attributes = True
 
 
+class FeedSectionResponse(BaseModel):
+    items: List[ArticleResponse]
+    next_cursor: Optional[str] = None
+
+
+class HomeResponse(BaseModel):
+    trending: FeedSectionResponse
+    categories: List[CategoryResponse]
+    category_feeds: Dict[str, FeedSectionResponse]
+
+
 class ArticleCreate(BaseModel):
     uuid: str
     title: str
@@ -65,3 +76,10 @@ class ArticleCreate(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ArticleIngestionResult(BaseModel):
+    inserted_ids: List[int] = []
+    inserted_by_category: Dict[str, List[int]] = {}
+    updated_ids: List[int] = []
+    skipped: int = 0
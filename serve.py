@@ -0,0 +1,49 @@
+import copy
+import os
+
+import uvicorn
+from uvicorn.config import LOGGING_CONFIG
+
+from core.settings import settings
+from db.pool_sizing import web_worker_count
+
+
+def log_config(level: str) -> dict:
+    """
+    Uvicorn's logging configuration plus a root handler, so the application's
+    own loggers (pool sizing, secret loading, export throughput, ...) are
+    written too instead of only uvicorn's.
+    """
+    config = copy.deepcopy(LOGGING_CONFIG)
+    config["formatters"]["app"] = {"format": "%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s"}
+    config["handlers"]["app"] = {
+        "formatter": "app",
+        "class": "logging.StreamHandler",
+        "stream": "ext://sys.stderr",
+    }
+    config["root"] = {"handlers": ["app"], "level": level.upper()}
+    return config
+
+
+def main():
+    """
+    Start the API with one uvicorn worker per available core, as far as the
+    connection budget allows, or WEB_CONCURRENCY workers when set. Each worker
+    sizes its connection pools from the same count, see db.pool_sizing.
+    """
+    log_level = os.getenv("LOG_LEVEL", "info")
+    workers = web_worker_count(settings.WEB_CONCURRENCY, settings.DB_MAX_CONNECTIONS, settings.DB_CELERY_CONNECTIONS)
+    # Exported so the worker processes divide the connection budget by the same number
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8080)),
+        workers=workers,
+        log_level=log_level,
+        log_config=log_config(log_level),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+import orjson
+import redis
+
+from services.redis_client import get_redis, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "articles:new"
+
+# Put on a subscriber's queue when it fell behind and missed events
+RESYNC = object()
+
+
+def publish_new_articles(
+        inserted_by_category: Optional[dict[str, list[int]]] = None,
+        trending: Optional[list[int]] = None
+):
+    """
+    Announce committed articles to every API process: ids of new articles by
+    category, and the ids of a newly set trending set. Call after the commit.
+    """
+    if not inserted_by_category and not trending:
+        return
+    event = {"categories": inserted_by_category or {}, "trending": trending or []}
+    try:
+        get_redis().publish(CHANNEL, orjson.dumps(event))
+    except redis.RedisError as e:
+        logger.error(f"Failed to publish new articles: {str(e)}")
+
+
+class ArticleEventHub:
+    """
+    Fans article events out to the clients connected to this process. A
+    single Redis subscription is shared by all of them; it is opened with
+    the first subscriber and reconnects on errors. Each subscriber has a
+    bounded queue; one that falls behind gets RESYNC instead of the events
+    it missed, so a slow client cannot hold up the others.
+    """
+
+    def __init__(self, queue_size: int = 100, reconnect_delay: float = 1.0):
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self._subscribers: set[asyncio.Queue] = set()
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    def _dispatch(self, event):
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    async def _listen(self):
+        while True:
+            try:
+                async with get_async_redis().pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    async for message in pubsub.listen():
+                        try:
+                            self._dispatch(orjson.loads(message["data"]))
+                        except orjson.JSONDecodeError:
+                            logger.warning(f"Ignoring malformed article event: {message['data']!r}")
+            except (redis.RedisError, OSError) as e:
+                logger.warning(f"Article event subscription lost, reconnecting: {str(e)}")
+                # Events published while disconnected are lost
+                self._dispatch(RESYNC)
+                await asyncio.sleep(self.reconnect_delay)
+
+
+article_event_hub = ArticleEventHub()
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.settings import settings
+from models.news import Category
+from services.redis_client import get_redis
+from services.version_counters import bump_version, read_version
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "category-registry:version-counter"
+NAMES_KEY = "category-registry:names"
+
+
+class CategoryRegistry:
+    """
+    Process-wide map of category names to ids, loaded once from the database.
+    Ingestion publishes newly inserted names through a version counter in
+    Redis; readers compare it at most every `check_interval_seconds` and
+    reload the table only when it moved. An unknown name also triggers a
+    reload, rate limited by the same interval.
+    """
+
+    def __init__(self, check_interval_seconds: int):
+        self.check_interval_seconds = check_interval_seconds
+        self._ids_by_name: dict[str, int] = {}
+        self._version: Optional[str] = None
+        self._loaded = False
+        self._checked_at = 0.0
+        self._reloaded_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Version of the category set this process last loaded, see `services.version_counters`."""
+        return self._version
+
+    async def _remote_version(self) -> Optional[str]:
+        try:
+            return await read_version(VERSION_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Category registry version read failed: {str(e)}")
+            return None
+
+    async def _reload(self, db: AsyncSession, version: Optional[str]):
+        rows = (await db.execute(select(Category.id, Category.name))).all()
+        self._ids_by_name = {name: category_id for category_id, name in rows}
+        self._version = version
+        self._loaded = True
+        self._reloaded_at = time.monotonic()
+
+    async def _refresh(self, db: AsyncSession, force: bool = False):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            if self._loaded and not force and now - self._checked_at < self.check_interval_seconds:
+                return
+            if force and now - self._reloaded_at < self.check_interval_seconds:
+                return
+            self._checked_at = now
+            version = await self._remote_version()
+            if force or not self._loaded or version is None or version != self._version:
+                await self._reload(db, version)
+
+    async def get_id(self, db: AsyncSession, name: str) -> Optional[int]:
+        """Resolve a category name to its id, or None when no such category exists."""
+        await self._refresh(db)
+        category_id = self._ids_by_name.get(name)
+        if category_id is None:
+            await self._refresh(db, force=True)
+            category_id = self._ids_by_name.get(name)
+        return category_id
+
+    async def all(self, db: AsyncSession) -> list[dict]:
+        """Return every category as served by the categories endpoint."""
+        await self._refresh(db)
+        return [
+            {"id": category_id, "name": name}
+            for name, category_id in sorted(self._ids_by_name.items(), key=lambda item: item[1])
+        ]
+
+    def register(self, category_ids_by_name: dict[str, int]):
+        """
+        Record committed categories. Names not seen before are announced to the
+        other processes by bumping the registry version.
+        """
+        self._ids_by_name.update(category_ids_by_name)
+        if not category_ids_by_name:
+            return
+
+        try:
+            client = get_redis()
+            added = client.sadd(NAMES_KEY, *category_ids_by_name)
+            if added:
+                bump_version(client, VERSION_KEY)
+        except redis.RedisError as e:
+            logger.error(f"Failed to publish new categories: {str(e)}")
+
+
+category_registry = CategoryRegistry(check_interval_seconds=settings.CATEGORY_REGISTRY_CHECK_SECONDS)
@@ -1,14 +1,24 @@
+import logging
+
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_ready, worker_shutdown
 
 from core.settings import settings
+from services import http_client
+
+logger = logging.getLogger(__name__)
 
 celery_app = Celery(
     "news_worker",
-    broker=settings.REDIS_URL,
-    backend=settings.REDIS_URL,
     include=["services.tasks"]  # Tasks will live here
 )
 
+# Resolved on first use, so importing the app does not load the secrets
+celery_app.add_defaults(lambda: {
+    "broker_url": settings.REDIS_URL,
+    "result_backend": settings.REDIS_URL,
+})
+
 celery_app.conf.update(
     task_serializer="json",
     result_serializer="json",
@@ -29,3 +39,19 @@ celery_app.conf.update(
     broker_connection_retry=True,
     broker_connection_max_retries=25
 )
+
+
+@worker_ready.connect
+def log_pool_configuration(**_):
+    from db.base import POOL_CONFIG
+
+    logger.info(f"DB pool configuration: {POOL_CONFIG}")
+
+
+# The threads pool runs tasks in the main process, which only sends worker_shutdown
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_worker_event_loop(**_):
+    """Close pooled connections and stop the persistent event loop of this worker process."""
+    http_client.worker_loop.run(http_client.close_http_client())
+    http_client.worker_loop.stop()
@@ -1,11 +1,91 @@
-import google
-from google.auth.transport import Request, requests
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+import jwt
+from google.auth.transport import requests
 from google.oauth2 import id_token
 
+logger = logging.getLogger(__name__)
+
 
 def get_cloud_run_id_token(target_url: str) -> str:
-    """Generate ID token for authenticated Cloud Run requests."""
-    credentials, _ = google.auth.default()
+    """
+    Generate ID token for authenticated Cloud Run requests. Blocking: talks to
+    the metadata server, which can be replaced by a local stand-in through
+    the GCE_METADATA_HOST environment variable.
+    """
     auth_req = requests.Request()
     token = id_token.fetch_id_token(auth_req, target_url)
     return token
+
+
+class IdTokenCache:
+    """
+    Per-audience cache of ID tokens. A token is reused until `expiry_margin`
+    seconds before its `exp`; within `refresh_ahead` seconds of it a refresh
+    starts in the background while callers keep the current token. Fetches
+    run in a worker thread and concurrent misses share a single fetch.
+    """
+
+    def __init__(
+            self,
+            fetcher: Callable[[str], str],
+            expiry_margin: float = 60,
+            refresh_ahead: float = 300
+    ):
+        self._fetcher = fetcher
+        self.expiry_margin = expiry_margin
+        self.refresh_ahead = refresh_ahead
+        self._tokens: dict[str, tuple[str, float]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def get(self, audience: str) -> str:
+        cached = self._tokens.get(audience)
+        if cached is not None:
+            token, expires_at = cached
+            remaining = expires_at - time.time()
+            if remaining > self.expiry_margin:
+                if remaining <= self.refresh_ahead:
+                    self._fetch_task(audience)
+                return token
+
+        return await asyncio.shield(self._fetch_task(audience))
+
+    def invalidate(self, audience: str):
+        """Drop a cached token, e.g. after the target rejected it."""
+        self._tokens.pop(audience, None)
+
+    def _fetch_task(self, audience: str) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(audience)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch(audience))
+            # Once per fetch, however many callers join it; background refreshes have no caller to raise to
+            task.add_done_callback(self._log_failure)
+            self._inflight[audience] = task
+        return task
+
+    async def _fetch(self, audience: str) -> str:
+        try:
+            token = await asyncio.to_thread(self._fetcher, audience)
+            claims = jwt.decode(token, options={"verify_signature": False})
+            self._tokens[audience] = (token, float(claims["exp"]))
+            return token
+        finally:
+            if self._inflight.get(audience) is asyncio.current_task():
+                del self._inflight[audience]
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"ID token fetch failed: {str(task.exception())}")
+
+
+id_token_cache = IdTokenCache(fetcher=get_cloud_run_id_token)
+
+
+async def get_cloud_run_id_token_async(target_url: str, cache: Optional[IdTokenCache] = None) -> str:
+    """ID token for a Cloud Run target, served from the per-audience cache."""
+    return await (cache or id_token_cache).get(target_url)
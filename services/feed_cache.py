@@ -0,0 +1,150 @@
+import logging
+from typing import Optional, Union
+from urllib.parse import quote
+
+import redis
+
+from core.settings import settings
+from services.redis_client import get_redis, get_async_redis
+from services.version_counters import bump_version, read_version
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_FEED = "category"
+TRENDING_FEED = "trending"
+
+KEY_PREFIX = "feed-cache"
+
+# A single category, a set of categories merged into one feed, or None for every category
+CategoryKey = Union[None, str, tuple[str, ...]]
+
+
+def _generation_key(feed: str) -> str:
+    return f"{KEY_PREFIX}:{feed}:generation-counter"
+
+
+def _category_segment(category: CategoryKey) -> str:
+    """
+    Names are escaped, so no category or set of categories a client can
+    request shares a segment with another one or with the unfiltered feed.
+    """
+    if category is None:
+        return "*"
+    if isinstance(category, tuple):
+        return "multi:" + ",".join(quote(name, safe="") for name in category)
+    return quote(category, safe="")
+
+
+def _page_key(
+        feed: str,
+        generation: str,
+        category: CategoryKey,
+        position: Optional[str],
+        page_size: int,
+        omit_negative_sentiment: bool
+) -> str:
+    return (
+        f"{KEY_PREFIX}:{feed}:{generation}:page:{_category_segment(category)}:{position or 'head'}"
+        f":{page_size}:{int(omit_negative_sentiment)}"
+    )
+
+
+async def get_generation(feed: str) -> Optional[str]:
+    """
+    Return the current ingestion generation of a feed, or None when caching is
+    disabled or Redis is unavailable. Read it before querying the database and
+    pass the same value to set_page, so a page computed concurrently with an
+    ingestion is stored under the generation it was read from. Generations
+    carry the epoch of their counter (see `services.version_counters`), so
+    they do not repeat after Redis loses data.
+    """
+    if not settings.FEED_CACHE_ENABLED:
+        return None
+    try:
+        return await read_version(_generation_key(feed))
+    except redis.RedisError as e:
+        logger.warning(f"Feed cache generation read failed: {str(e)}")
+        return None
+
+
+def bump_generation(*feeds: str):
+    """
+    Advance the generation of the given feeds. Page keys embed the generation,
+    so every page cached before the bump becomes unreachable immediately and
+    expires on its own TTL.
+    """
+    if not settings.FEED_CACHE_ENABLED:
+        return
+    try:
+        pipe = get_redis().pipeline()
+        for feed in feeds:
+            bump_version(pipe, _generation_key(feed))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"Failed to bump feed cache generation: {str(e)}")
+
+
+async def get_page(
+        feed: str,
+        generation: Optional[str],
+        category: CategoryKey = None,
+        position: Optional[str] = None,
+        page_size: int = 25,
+        omit_negative_sentiment: bool = False
+) -> Optional[tuple[str, Optional[str]]]:
+    """
+    Return the JSON body and next cursor of a cached feed page, or None on a
+    miss or when Redis is unavailable.
+    """
+    if generation is None:
+        return None
+    key = _page_key(feed, generation, category, position, page_size, omit_negative_sentiment)
+    try:
+        cached = await get_async_redis().hgetall(key)
+    except redis.RedisError as e:
+        logger.warning(f"Feed cache read failed: {str(e)}")
+        return None
+    if not cached:
+        return None
+    return cached["body"], cached.get("next_cursor") or None
+
+
+async def has_page(
+        feed: str,
+        generation: Optional[str],
+        category: CategoryKey = None,
+        position: Optional[str] = None,
+        page_size: int = 25,
+        omit_negative_sentiment: bool = False
+) -> bool:
+    """Whether a page is cached, treating Redis errors and disabled caching as cached."""
+    if generation is None:
+        return True
+    key = _page_key(feed, generation, category, position, page_size, omit_negative_sentiment)
+    try:
+        return bool(await get_async_redis().exists(key))
+    except redis.RedisError:
+        return True
+
+
+async def set_page(
+        page: bytes,
+        next_cursor: Optional[str],
+        feed: str,
+        generation: Optional[str],
+        category: CategoryKey = None,
+        position: Optional[str] = None,
+        page_size: int = 25,
+        omit_negative_sentiment: bool = False
+):
+    """Store the JSON body and next cursor of a feed page under the generation it was read from."""
+    if generation is None:
+        return
+    key = _page_key(feed, generation, category, position, page_size, omit_negative_sentiment)
+    try:
+        pipe = get_async_redis().pipeline()
+        pipe.hset(key, mapping={"body": page, "next_cursor": next_cursor or ""})
+        pipe.expire(key, settings.FEED_CACHE_TTL_SECONDS)
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Feed cache write failed: {str(e)}")
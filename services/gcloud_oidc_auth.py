@@ -1,23 +1,105 @@
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
 import jwt
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jwt import decode, PyJWKClient
+from jwt import decode, PyJWKSet
 
 from core.settings import settings
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
-JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+JWKS_URL = settings.SCHEDULER_JWKS_URL
 ISSUER = "https://accounts.google.com"
 AUDIENCE = settings.SCHEDULER_AUDIENCE
 
-jwks_client = PyJWKClient(JWKS_URL)
+
+class AsyncJWKSProvider:
+    """
+    Signing keys for service tokens, fetched without blocking the event loop.
+    Keys are prefetched on startup, refreshed every `refresh_interval`
+    seconds and on an unknown `kid` (at most once per `min_refresh_interval`).
+    Concurrent refreshes share one fetch. `file://` URLs read a local JWKS.
+    """
+
+    def __init__(self, jwks_url: str, refresh_interval: float = 3600, min_refresh_interval: float = 30):
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._fetched_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Prefetch the key set and keep it refreshed in the background."""
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to prefetch JWKS from {self.jwks_url}: {str(e)}")
+        self._refresher = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
+
+    async def refresh(self):
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+        await asyncio.shield(self._inflight)
+
+    async def get_signing_key(self, token: str) -> jwt.PyJWK:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid)
+        if key is None and (not self._keys or time.monotonic() - self._fetched_at >= self.min_refresh_interval):
+            await self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unable to find a signing key that matches: {kid}")
+        return key
+
+    async def _fetch(self):
+        self._fetched_at = time.monotonic()
+        parsed = urlparse(self.jwks_url)
+        if parsed.scheme == "file":
+            data = json.loads(await asyncio.to_thread(Path(parsed.path).read_text))
+        else:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+                data = response.json()
+
+        self._keys = {key.key_id: key for key in PyJWKSet.from_dict(data).keys}
+
+    async def _refresh_periodically(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh JWKS from {self.jwks_url}: {str(e)}")
+
+
+jwks_provider = AsyncJWKSProvider(JWKS_URL)
 
 
 async def verify_internal_service_token(
         credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     try:
-        signing_key = jwks_client.get_signing_key_from_jwt(credentials.credentials)
+        signing_key = await jwks_provider.get_signing_key(credentials.credentials)
         payload = decode(
             credentials.credentials,
             signing_key.key,
@@ -28,3 +110,5 @@ async def verify_internal_service_token(
         return payload
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid service token")
+    except (httpx.HTTPError, OSError, ValueError, jwt.PyJWKSetError):
+        raise HTTPException(status_code=503, detail="Service token keys are unavailable")
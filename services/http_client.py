@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+
+from core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerEventLoop:
+    """
+    A long-lived event loop on a daemon thread, one per worker process. Sync
+    code such as Celery tasks submits coroutines to it instead of calling
+    asyncio.run, so loop-bound resources like the pooled HTTP client and the
+    ID token cache survive between task runs.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked child inherits the object but not the loop's thread
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name="worker-event-loop", daemon=True).start()
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the persistent loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.get_loop()).result()
+
+    def stop(self):
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+
+worker_loop = WorkerEventLoop()
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    The process-wide pooled client for outbound service calls. Connections
+    are kept alive between calls; must be used from a single event loop.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            http2=settings.HTTP2_ENABLED,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def timed_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request through the pooled client and log how long it took, and
+    how much of that went into opening a new TCP/TLS connection.
+    """
+    marks: dict[str, float] = {}
+
+    async def trace(event_name: str, _info: dict):
+        marks[event_name] = time.perf_counter()
+
+    started = time.perf_counter()
+    response = await get_http_client().request(method, url, extensions={"trace": trace}, **kwargs)
+    total_ms = (time.perf_counter() - started) * 1000
+
+    connect_started = marks.get("connection.connect_tcp.started")
+    connect_finished = marks.get("connection.start_tls.complete", marks.get("connection.connect_tcp.complete"))
+    if connect_started is not None and connect_finished is not None:
+        connection = f"new connection {(connect_finished - connect_started) * 1000:.1f}ms"
+    else:
+        connection = "reused connection"
+    logger.info(
+        f"{method} {url} -> {response.status_code} in {total_ms:.1f}ms "
+        f"({connection}, {response.http_version})"
+    )
+    return response
+
+
+async def close_http_client():
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
@@ -0,0 +1,25 @@
+from typing import Optional
+
+import redis
+from redis import asyncio as aioredis
+
+from core.settings import settings
+
+_redis_client: Optional[redis.Redis] = None
+_async_redis_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Lazily create the sync Redis client, shared with the Celery broker's Redis."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Lazily create the async Redis client used by the API endpoints."""
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _async_redis_client
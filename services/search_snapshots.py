@@ -0,0 +1,48 @@
+import logging
+import secrets
+from typing import List, Optional
+
+import redis
+
+from core.settings import settings
+from services.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "search-snapshot"
+
+
+def _key(snapshot: str) -> str:
+    return f"{KEY_PREFIX}:{snapshot}"
+
+
+async def save(article_ids: List[int]) -> Optional[str]:
+    """
+    Keep the ranked result ids of a search for SEARCH_SNAPSHOT_TTL_SECONDS and
+    return the snapshot's name, or None when Redis is unavailable.
+    """
+    snapshot = secrets.token_urlsafe(12)
+    try:
+        pipe = get_async_redis().pipeline()
+        pipe.rpush(_key(snapshot), *article_ids)
+        pipe.expire(_key(snapshot), settings.SEARCH_SNAPSHOT_TTL_SECONDS)
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Search snapshot write failed: {str(e)}")
+        return None
+    return snapshot
+
+
+async def get_ids(snapshot: str, offset: int, count: int) -> Optional[List[int]]:
+    """Up to `count` result ids from `offset` on, or None when the snapshot expired or Redis is unavailable."""
+    try:
+        pipe = get_async_redis().pipeline()
+        pipe.exists(_key(snapshot))
+        pipe.lrange(_key(snapshot), offset, offset + count - 1)
+        exists, article_ids = await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Search snapshot read failed: {str(e)}")
+        return None
+    if not exists:
+        return None
+    return [int(article_id) for article_id in article_ids]
@@ -1,5 +1,6 @@
 import asyncio
-from typing import List
+import time
+from typing import List, Optional
 
 import httpx
 from celery.utils.log import get_task_logger
@@ -8,7 +9,7 @@ from sqlalchemy.orm import Session
 from core.settings import settings
 from db.base import get_db
 from repositories import article
-from services import cloud_run_auth
+from services import article_events, cloud_run_auth, http_client
 from services.celery_config import celery_app
 from utils.utils import retrieve_news_content
 
@@ -19,46 +20,216 @@ async def trigger_scraper(
         last_item_uuid: str = None,
         limit: int = 25,
 ):
-    async with httpx.AsyncClient() as client:
-        auth_token = cloud_run_auth.get_cloud_run_id_token(
-            settings.SCRAPER_SERVICE_URL
-        )
-        logger.info("Successfully authenticated with scraper service. Fetching news...")
-        headers = {"Authorization": f"Bearer {auth_token}"}
-        params = {"last_item_uuid": last_item_uuid, "limit": limit}
-        url = f"{settings.SCRAPER_SERVICE_URL}/fetch_news"
-        response = await client.get(
-            headers=headers,
-            url=url,
-            params=params,
-            timeout=30
-        )
-        response.raise_for_status()
-        return response.json()
+    auth_token = await cloud_run_auth.get_cloud_run_id_token_async(
+        settings.SCRAPER_SERVICE_URL
+    )
+    logger.info("Successfully authenticated with scraper service. Fetching news...")
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    params = {"last_item_uuid": last_item_uuid, "limit": limit}
+    url = f"{settings.SCRAPER_SERVICE_URL}/fetch_news"
+    response = await http_client.timed_request(
+        "GET",
+        url,
+        headers=headers,
+        params=params,
+        timeout=30
+    )
+    response.raise_for_status()
+    return response.json()
 
 
-async def trigger_ml_inference(data: dict[str, List[str]]):
-    async with httpx.AsyncClient() as client:
-        auth_token = cloud_run_auth.get_cloud_run_id_token(
-            settings.ML_INFERENCE_SERVICE_URL
-        )
-        logger.info("Successfully authenticated with ML inference service. Predicting...")
-        headers = {"Authorization": f"Bearer {auth_token}"}
-        url = f"{settings.ML_INFERENCE_SERVICE_URL}/predict"
-        response = await client.post(
-            headers=headers,
-            url=url,
-            json=data,
-            timeout=180
-        )
-        response.raise_for_status()
-        return response.json()
+async def trigger_ml_inference(data: dict[str, List[str]], timeout: float = 180):
+    auth_token = await cloud_run_auth.get_cloud_run_id_token_async(
+        settings.ML_INFERENCE_SERVICE_URL
+    )
+    logger.info("Successfully authenticated with ML inference service. Predicting...")
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    url = f"{settings.ML_INFERENCE_SERVICE_URL}/predict"
+    response = await http_client.timed_request(
+        "POST",
+        url,
+        headers=headers,
+        json=data,
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+_STAGE_DONE = None
+
+
+async def _scrape_pages(
+        last_item_uuid: Optional[str],
+        ml_queue: asyncio.Queue,
+        window: asyncio.Semaphore,
+        trending_uuids: List[str]
+):
+    """
+    Pipeline stage 1: page through the scraper from `last_item_uuid` and hand
+    fixed-size chunks of news items, numbered in scraper order, to the ML stage
+    as soon as each page arrives. `window` bounds the chunks not yet written.
+    """
+    chunk_size = settings.INGEST_ML_CHUNK_SIZE
+    cursor = last_item_uuid
+    sequence = 0
+    for _ in range(settings.SCRAPER_MAX_PAGES):
+        page = await trigger_scraper(last_item_uuid=cursor, limit=settings.SCRAPER_PAGE_SIZE)
+        if not page:
+            break
+
+        trending_uuids.extend(item["uuid"] for item in page if item.get("isTrending"))
+        for start in range(0, len(page), chunk_size):
+            await window.acquire()
+            await ml_queue.put((sequence, page[start:start + chunk_size]))
+            sequence += 1
+
+        if len(page) < settings.SCRAPER_PAGE_SIZE:
+            break
+        cursor = page[-1].get("uuid")
+
+
+async def _predict_chunks(ml_queue: asyncio.Queue, db_queue: asyncio.Queue):
+    """Pipeline stage 2: one of several concurrent consumers sending chunk titles to `/predict`."""
+    while (numbered_chunk := await ml_queue.get()) is not _STAGE_DONE:
+        sequence, news_chunk = numbered_chunk
+        titles = [item["title"] for item in news_chunk if "title" in item]
+        ml_results = None
+        if titles:
+            ml_results = await trigger_ml_inference(
+                {"texts": titles},
+                timeout=settings.INGEST_ML_TIMEOUT_SECONDS
+            )
+        # Chunks without titles are passed on too, the writer waits for every sequence number
+        await db_queue.put((sequence, news_chunk, ml_results))
+
+
+async def _write_chunk(db: Session, news_chunk: list, ml_results: Optional[dict], totals: dict):
+    if ml_results is None:
+        return
+    article_creates, categories_set, sources_map = retrieve_news_content(
+        news_data=news_chunk,
+        ml_data=ml_results
+    )
+    if not article_creates:
+        return
+
+    write = asyncio.ensure_future(asyncio.to_thread(
+        article.create_articles,
+        db=db,
+        article_creates=article_creates,
+        categories_set=categories_set,
+        sources_map=sources_map,
+        replace_trending=False
+    ))
+    try:
+        ingestion = await asyncio.shield(write)
+    except asyncio.CancelledError:
+        # The thread cannot be interrupted: let it finish with the session
+        # before the failure reaches the task, which then rolls it back
+        await asyncio.wait([write])
+        raise
+    # The chunk is committed: let connected clients know right away
+    await asyncio.to_thread(article_events.publish_new_articles, ingestion.inserted_by_category)
+    totals["received"] += len(article_creates)
+    totals["inserted"] += len(ingestion.inserted_ids)
+    totals["updated"] += len(ingestion.updated_ids)
+    totals["skipped"] += ingestion.skipped
+
+
+async def _write_chunks(
+        db: Session,
+        db_queue: asyncio.Queue,
+        window: asyncio.Semaphore,
+        totals: dict,
+        written_uuids: set[str]
+):
+    """
+    Pipeline stage 3: write predicted chunks in scraper order, each as soon as
+    every chunk before it is written. Written articles are therefore always a
+    prefix of the scraped ones, so a failed run resumes after the last article
+    in the database without losing chunks that were still being predicted. The
+    session is only ever used by this single consumer, one chunk at a time.
+    The uuids of written chunks are added to `written_uuids`.
+    """
+    pending = {}
+    next_sequence = 0
+    while (predicted := await db_queue.get()) is not _STAGE_DONE:
+        sequence, news_chunk, ml_results = predicted
+        pending[sequence] = (news_chunk, ml_results)
+        while next_sequence in pending:
+            news_chunk, ml_results = pending.pop(next_sequence)
+            await _write_chunk(db, news_chunk, ml_results, totals)
+            written_uuids.update(item.get("uuid") for item in news_chunk)
+            next_sequence += 1
+            window.release()
+
+
+async def _set_written_trending(db: Session, trending_uuids: List[str], written_uuids: set[str], totals: dict):
+    """Make the trending articles of the written chunks, in scraper order, the trending set."""
+    ranked_uuids = [uuid for uuid in trending_uuids if uuid in written_uuids]
+    if not ranked_uuids or not totals["received"]:
+        return
+    # A chunk that failed to write leaves its transaction open, the chunks before it are committed
+    await asyncio.to_thread(db.rollback)
+    trending_ids = await asyncio.to_thread(article.set_trending_articles, db=db, ranked_uuids=ranked_uuids)
+    await asyncio.to_thread(article_events.publish_new_articles, trending=trending_ids)
+
+
+async def run_ingestion_pipeline(db: Session, last_item_uuid: Optional[str]) -> dict:
+    """
+    Stream news from the scraper through ML inference into the database with
+    the three stages overlapping: pages are chunked as they arrive, up to
+    INGEST_ML_CONCURRENCY chunks are predicted at once, and chunks are written
+    in scraper order as soon as their predictions return. Bounded queues and
+    a window of unwritten chunks keep a slow stage from buffering the whole
+    run in memory. The trending set is replaced once the stages finish, with
+    the trending articles of the chunks written by then. This happens when a
+    stage fails too, because the retry resumes after the written chunks and
+    never sees their articles again.
+    """
+    concurrency = settings.INGEST_ML_CONCURRENCY
+    ml_queue = asyncio.Queue(maxsize=concurrency * 2)
+    db_queue = asyncio.Queue(maxsize=concurrency * 2)
+    window = asyncio.Semaphore(concurrency * 4)
+    trending_uuids: List[str] = []
+    written_uuids: set[str] = set()
+    totals = {"received": 0, "inserted": 0, "updated": 0, "skipped": 0}
+
+    async def produce():
+        await _scrape_pages(last_item_uuid, ml_queue, window, trending_uuids)
+        for _ in range(concurrency):
+            await ml_queue.put(_STAGE_DONE)
+
+    async def predict():
+        async with asyncio.TaskGroup() as ml_workers:
+            for _ in range(concurrency):
+                ml_workers.create_task(_predict_chunks(ml_queue, db_queue))
+        await db_queue.put(_STAGE_DONE)
+
+    try:
+        async with asyncio.TaskGroup() as stages:
+            stages.create_task(produce())
+            stages.create_task(predict())
+            stages.create_task(_write_chunks(db, db_queue, window, totals, written_uuids))
+    except BaseException as failure:
+        try:
+            await _set_written_trending(db, trending_uuids, written_uuids, totals)
+        except Exception as e:
+            logger.error(f"Setting the trending articles of the written chunks failed: {str(e)}")
+        # Surface the first stage failure as a plain exception for the task's retry handling
+        while isinstance(failure, ExceptionGroup):
+            failure = failure.exceptions[0]
+        raise failure
+
+    await _set_written_trending(db, trending_uuids, written_uuids, totals)
+    return totals
 
 
 @celery_app.task(bind=True)
 def fetch_and_save_news(self):
     """
-    Celery task to fetch news and process through ML.
+    Celery task to fetch news and process through ML, pipelined in chunks.
     """
     db_gen = get_db()
     db: Session = next(db_gen)
@@ -67,31 +238,26 @@ def fetch_and_save_news(self):
         last_item_uuid = article.get_last_item_uuid(db=db)
         logger.info(f"Starting process with last_item_uuid: {last_item_uuid}")
 
-        news_data = asyncio.run(trigger_scraper(last_item_uuid=last_item_uuid))
-        if not news_data:
-            logger.info("No new news to process.")
-            return {"status": "success", "processed": 0}
-
-        titles = [item["title"] for item in news_data if "title" in item]
-
-        ml_results = asyncio.run(trigger_ml_inference({"texts": titles}))
+        started = time.perf_counter()
+        totals = http_client.worker_loop.run(run_ingestion_pipeline(db=db, last_item_uuid=last_item_uuid))
+        elapsed = time.perf_counter() - started
 
-        article_creates, categories_set, sources_map = retrieve_news_content(
-            news_data=news_data,
-            ml_data=ml_results
-        )
-
-        logger.info(f"Successfully processed {len(article_creates)} articles. Inserting into database...")
+        if not totals["received"]:
+            logger.info("No new news to process.")
+            return {"status": "success", "processed": 0, "inserted": 0, "updated": 0, "skipped": 0}
 
-        db_articles = article.create_articles(
-            db=db,
-            article_creates=article_creates,
-            categories_set=categories_set,
-            sources_map=sources_map
+        logger.info(
+            f"Successfully inserted {totals['inserted']} articles, updated {totals['updated']}, "
+            f"skipped {totals['skipped']} in {elapsed:.3f}s "
+            f"({totals['received'] / elapsed if elapsed else 0:.0f} rows/s)"
         )
-        articles_count = len(db_articles)
-        logger.info(f"Successfully inserted {len(db_articles)} articles")
-        return {"status": "success", "processed": articles_count}
+        return {
+            "status": "success",
+            "processed": totals["inserted"],
+            "inserted": totals["inserted"],
+            "updated": totals["updated"],
+            "skipped": totals["skipped"],
+        }
 
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching news: {str(e)}")
@@ -0,0 +1,30 @@
+import secrets
+from typing import Union
+
+import redis
+
+from services.redis_client import get_async_redis
+
+EPOCH_FIELD = "epoch"
+COUNT_FIELD = "count"
+
+
+async def read_version(key: str) -> str:
+    """
+    Read the version counter stored in the Redis hash `key`, as "<epoch>.<count>".
+
+    The hash keeps a random epoch next to the count, set on first read. When
+    Redis loses the hash (eviction, flush, restart without persistence), the
+    count starts over at 0 under a new epoch, so versions handed out before are
+    never repeated. Raises redis.RedisError when Redis is unavailable.
+    """
+    pipe = get_async_redis().pipeline()
+    pipe.hsetnx(key, EPOCH_FIELD, secrets.token_hex(4))
+    pipe.hmget(key, EPOCH_FIELD, COUNT_FIELD)
+    _, (epoch, count) = await pipe.execute()
+    return f"{epoch}.{count or 0}"
+
+
+def bump_version(client: Union[redis.Redis, redis.client.Pipeline], key: str):
+    """Advance the version counter in the Redis hash `key`, on a client or a pipeline."""
+    client.hincrby(key, COUNT_FIELD, 1)
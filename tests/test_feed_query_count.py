@@ -0,0 +1,92 @@
+"""
+The feed repositories load a page, sources and categories included, in a
+fixed number of queries, however large the page is.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from db.base import Base
+from models.news import Article, Category, Source
+from repositories.article import get_category_articles, get_trending_articles
+from utils.mapper import serialize_feed_page
+
+ARTICLES = 240
+SMALL_PAGE = 5
+LARGE_PAGE = 50
+
+
+class SessionAdapter:
+    """Runs the repositories' `await db.execute(...)` on a sync session, there is no async SQLite driver."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    published_at = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [dict(id=i, name=f"category-{i}") for i in (1, 2)])
+        conn.execute(insert(Source), [dict(id=i, name=f"source-{i}") for i in (1, 2, 3)])
+        conn.execute(insert(Article), [
+            dict(
+                id=i,
+                uuid=f"uuid-{i}",
+                title=f"title {i}",
+                url=f"https://example.com/{i}",
+                published_at=published_at - timedelta(minutes=i),
+                sentiment="positive" if i % 4 < 2 else "negative",
+                is_trending=i % 2 == 0,
+                source_id=i % 3 + 1,
+                category_id=i % 2 + 1,
+            )
+            for i in range(1, ARTICLES + 1)
+        ])
+    yield engine
+    engine.dispose()
+
+
+def count_queries(engine, fetch, page_size: int) -> tuple[int, int]:
+    """Queries issued while fetching and serializing one page, and the page's length."""
+    statements = []
+
+    def record(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with Session(engine) as session:
+            rows = asyncio.run(fetch(SessionAdapter(session), page_size=page_size))
+            serialize_feed_page(rows)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements), len(rows)
+
+
+FEEDS = {
+    "all categories": lambda db, page_size: get_category_articles(db, page_size=page_size),
+    "category": lambda db, page_size: get_category_articles(db, category_id=2, page_size=page_size),
+    "trending": lambda db, page_size: get_trending_articles(db, page_size=page_size),
+    "trending without negative sentiment": lambda db, page_size: get_trending_articles(
+        db, omit_negative_sentiment=True, page_size=page_size
+    ),
+}
+
+
+@pytest.mark.parametrize("name", FEEDS)
+def test_queries_per_page_do_not_grow_with_page_size(engine, name):
+    small_queries, small_rows = count_queries(engine, FEEDS[name], SMALL_PAGE)
+    large_queries, large_rows = count_queries(engine, FEEDS[name], LARGE_PAGE)
+
+    assert (small_rows, large_rows) == (SMALL_PAGE, LARGE_PAGE)
+    assert small_queries == large_queries == 1
@@ -1,5 +1,8 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
+
+import orjson
+from sqlalchemy import Row
 
 from models.news import Article
 from schemas.news import ArticleCreate, SourceCreate
@@ -29,14 +32,16 @@ def map_to_article_create(news_item: Dict[str, Any], ml_data: Dict[str, Any]):
     )
 
 
-def article_create_to_article(
+def article_create_to_row(
         article_create: ArticleCreate,
         category_id: int,
         source_id: int,
-) -> Article:
+        trending_rank: int | None = None,
+) -> Dict[str, Any]:
+    """Column values of an `articles` row, for Core bulk inserts."""
     title = article_create.title[:500] if article_create.title else None
     description = article_create.description[:1000] if article_create.description else None
-    return Article(
+    return dict(
         uuid=article_create.uuid,
         title=title,
         url=article_create.url,
@@ -44,13 +49,58 @@ def article_create_to_article(
         url_to_image=article_create.url_to_image,
         published_at=article_create.published_at,
         sentiment=article_create.sentiment,
+        is_trending=trending_rank is not None,
+        trending_rank=trending_rank,
         source_id=source_id,
         category_id=category_id,
     )
 
 
+def article_create_to_article(
+        article_create: ArticleCreate,
+        category_id: int,
+        source_id: int,
+) -> Article:
+    return Article(**article_create_to_row(article_create, category_id, source_id))
+
+
 def map_to_source_create(name: str, logo_url: str | None) -> SourceCreate:
     return SourceCreate(
         name=name,
         logo_url=logo_url
     )
+
+
+def article_row_to_response(row: Row) -> Dict[str, Any]:
+    """
+    A feed row from `repositories.article._feed_select` in the shape of
+    `ArticleResponse`. The columns are already typed by the database, so the
+    model is not validated again. Extra trailing columns are ignored.
+    """
+    (
+        article_id, title, url, description, url_to_image, published_at, sentiment,
+        source_id, source_name, source_logo_url, category_id, category_name, *_
+    ) = row
+    return {
+        "id": article_id,
+        "title": title,
+        "url": url,
+        "description": description,
+        "url_to_image": url_to_image,
+        "published_at": published_at,
+        "source": {"id": source_id, "name": source_name, "logo_url": source_logo_url},
+        "sentiment": sentiment,
+        "category": {"id": category_id, "name": category_name},
+    }
+
+
+def serialize_feed_page(rows: Iterable[Row]) -> bytes:
+    """JSON body of a feed page, as served by the news endpoints."""
+    return orjson.dumps([article_row_to_response(row) for row in rows])
+
+
+def feed_section_json(page: bytes | str, next_cursor: str | None) -> bytes:
+    """A serialized feed page and its cursor as a `FeedSectionResponse` JSON object."""
+    if isinstance(page, str):
+        page = page.encode("utf-8")
+    return b'{"items":' + page + b',"next_cursor":' + orjson.dumps(next_cursor) + b"}"